@@ -0,0 +1,35 @@
+"""Store notification metadata as JSONB
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Convert notifications.metadata from JSON text to JSONB
+    op.alter_column('notifications', 'metadata',
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using='metadata::jsonb'
+    )
+
+
+def downgrade():
+    op.alter_column('notifications', 'metadata',
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.Text(),
+        existing_nullable=True,
+        postgresql_using='metadata::text'
+    )
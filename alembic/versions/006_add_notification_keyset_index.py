@@ -0,0 +1,24 @@
+"""Add composite index for notification keyset pagination
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT n
+    op.create_index('ix_notifications_user_created_id', 'notifications', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_created_id', table_name='notifications')
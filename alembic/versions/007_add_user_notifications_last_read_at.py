@@ -0,0 +1,24 @@
+"""Add notifications read watermark to users
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Notifications created at or before this are treated as read
+    op.add_column('users', sa.Column('notifications_last_read_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('users', 'notifications_last_read_at')
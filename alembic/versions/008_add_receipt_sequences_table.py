@@ -0,0 +1,37 @@
+"""Add receipt_sequences table for atomic receipt numbering
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create receipt_sequences table
+    op.create_table('receipt_sequences',
+        sa.Column('year_month', sa.String(length=6), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('year_month')
+    )
+
+    # Seed counters from receipts issued so far
+    op.execute("""
+        INSERT INTO receipt_sequences (year_month, last_seq)
+        SELECT left(receipt_number, 6), max(right(receipt_number, 4)::integer)
+        FROM payment_receipts
+        WHERE receipt_number ~ '^[0-9]{10}$'
+        GROUP BY left(receipt_number, 6)
+    """)
+
+
+def downgrade():
+    op.drop_table('receipt_sequences')
@@ -0,0 +1,28 @@
+"""Add payment receipt listing indexes
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serve the user/admin receipt listings (ORDER BY created_at DESC, id DESC)
+    op.create_index('ix_payment_receipts_user_created', 'payment_receipts', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_payment_receipts_user_type_status_created', 'payment_receipts', ['user_id', 'receipt_type', 'status', 'created_at'], unique=False)
+    op.create_index('ix_payment_receipts_created', 'payment_receipts', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_payment_receipts_created', table_name='payment_receipts')
+    op.drop_index('ix_payment_receipts_user_type_status_created', table_name='payment_receipts')
+    op.drop_index('ix_payment_receipts_user_created', table_name='payment_receipts')
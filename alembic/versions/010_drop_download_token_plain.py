@@ -0,0 +1,24 @@
+"""Drop plain download tokens
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tokens are looked up by hash; the plain value is no longer stored
+    op.drop_column('secure_download_tokens', 'token_plain')
+
+
+def downgrade():
+    op.add_column('secure_download_tokens', sa.Column('token_plain', sa.String(length=255), nullable=True))
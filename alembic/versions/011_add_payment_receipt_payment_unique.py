@@ -0,0 +1,24 @@
+"""Make payment receipts unique per payment
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backs INSERT ... ON CONFLICT (payment_id) in receipt creation
+    op.create_index('uq_payment_receipts_payment_id', 'payment_receipts', ['payment_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_payment_receipts_payment_id', table_name='payment_receipts')
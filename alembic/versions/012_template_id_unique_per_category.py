@@ -0,0 +1,29 @@
+"""Make template ids unique per category
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Invoice and receipt templates share ids such as 'classic'; backs
+    # INSERT ... ON CONFLICT (category, template_id) in template seeding
+    op.drop_index('ix_templates_template_id', table_name='templates')
+    op.create_index('ix_templates_template_id', 'templates', ['template_id'], unique=False)
+    op.create_index('uq_templates_category_template_id', 'templates', ['category', 'template_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_templates_category_template_id', table_name='templates')
+    op.drop_index('ix_templates_template_id', table_name='templates')
+    op.create_index('ix_templates_template_id', 'templates', ['template_id'], unique=True)
@@ -0,0 +1,37 @@
+"""Add receipt audit actions
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+_AUDIT_ACTIONS = (
+    'RECEIPT_CREATED',
+    'RECEIPTS_BULK_CREATED',
+    'RECEIPT_PDF_GENERATED',
+    'RECEIPT_SENT',
+    'RECEIPT_PDF_DOWNLOADED',
+    'RECEIPT_UPDATED',
+)
+
+
+def upgrade():
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction block before PostgreSQL 12
+    with op.get_context().autocommit_block():
+        for action in _AUDIT_ACTIONS:
+            op.execute(f"ALTER TYPE auditaction ADD VALUE IF NOT EXISTS '{action}'")
+        op.execute("ALTER TYPE adminactiontype ADD VALUE IF NOT EXISTS 'RECEIPT_MANAGEMENT'")
+
+
+def downgrade():
+    # PostgreSQL cannot drop values from an enum type; the extra labels are harmless
+    pass
@@ -1,15 +1,15 @@
 """Invoice management API routes."""
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 import os
 
 from app.database import get_db
-from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceResponse, InvoiceListResponse
+from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceResponse, InvoiceListResponse, InvoiceBulkPDFRequest
 from app.services.invoice_service import InvoiceService
-from app.services.pdf_service import PDFService
+from app.services.pdf_service import PDFService, render_invoice_pdf_task
 from app.services.subscription_service import SubscriptionService
 from app.core.deps import get_current_active_user
 from app.models.user import User
@@ -139,6 +139,57 @@ def finalize_invoice(
         )
 
 
+def _require_pdf_access(db: Session, user: User) -> None:
+    """Reject users without a paid subscription."""
+    subscription_service = SubscriptionService(db)
+    subscription = subscription_service.get_user_subscription(user.id)
+    
+    if not subscription or subscription.plan.price == 0:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="PDF download requires paid subscription"
+        )
+
+
+@router.post("/pdf/bulk")
+def generate_invoice_pdfs_bulk(
+    request: InvoiceBulkPDFRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Generate PDFs for several invoices in one request."""
+    _require_pdf_access(db, current_user)
+    
+    results = PDFService(db).generate_invoice_pdfs_bulk(request.invoice_ids, current_user.id)
+    
+    return {
+        "generated": [invoice_id for invoice_id, path in results.items() if path],
+        "failed": [invoice_id for invoice_id, path in results.items() if not path]
+    }
+
+
+@router.post("/{invoice_id}/pdf", status_code=status.HTTP_202_ACCEPTED)
+def queue_invoice_pdf(
+    invoice_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Queue (re)generation of an invoice PDF without waiting for the render."""
+    _require_pdf_access(db, current_user)
+    
+    job = PDFService(db).prepare_invoice_pdf(invoice_id, current_user.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invoice not found"
+        )
+    
+    background_tasks.add_task(render_invoice_pdf_task, job)
+    
+    return {"message": "Invoice PDF queued", "invoice_id": invoice_id}
+
+
 @router.get("/{invoice_id}/pdf")
 def download_invoice_pdf(
     invoice_id: int,
@@ -147,14 +198,7 @@ def download_invoice_pdf(
 ):
     """Download invoice as PDF."""
     # Check subscription for PDF access
-    subscription_service = SubscriptionService(db)
-    subscription = subscription_service.get_user_subscription(current_user.id)
-    
-    if not subscription or subscription.plan.price == 0:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="PDF download requires paid subscription"
-        )
+    _require_pdf_access(db, current_user)
     
     # Get invoice
     invoice_service = InvoiceService(db)
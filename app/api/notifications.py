@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.user import User
 from app.models.notification import Notification, NotificationType
 from app.services.notification_service import NotificationService
@@ -20,20 +21,20 @@ router = APIRouter()
 
 @router.get("/", response_model=NotificationListResponse)
 def get_notifications(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     unread_only: bool = Query(False),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user notifications with pagination."""
+    """Get user notifications with cursor pagination."""
     
     notification_service = NotificationService(db)
     
-    notifications = notification_service.get_user_notifications(
+    notifications, next_cursor = notification_service.get_user_notifications(
         user_id=current_user.id,
         limit=limit,
-        offset=skip,
+        cursor=decode_cursor(cursor),
         unread_only=unread_only
     )
     
@@ -43,7 +44,8 @@ def get_notifications(
         notifications=[NotificationResponse.from_orm(n) for n in notifications],
         total_count=len(notifications),
         unread_count=unread_count,
-        has_more=len(notifications) == limit
+        has_more=next_cursor is not None,
+        next_cursor=encode_cursor(next_cursor)
     )
 
 
@@ -110,6 +112,7 @@ def get_notification(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
+    notification.last_read_at = current_user.notifications_last_read_at
     return NotificationResponse.from_orm(notification)
 
 
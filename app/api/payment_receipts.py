@@ -2,15 +2,21 @@
 
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from fastapi.responses import FileResponse
+from enum import Enum
+import csv
+import io
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user, get_current_admin_user
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.security import hash_download_token
 from app.models.user import User
+from app.models.audit_log import AuditAction
 from app.models.payment_receipt import PaymentReceipt, ReceiptStatus, ReceiptType
 from app.models.secure_download_token import SecureDownloadToken
-from app.services.payment_receipt_service import PaymentReceiptService
+from app.services.payment_receipt_service import PaymentReceiptService, send_receipt_email_task
 from app.services.audit_service import AuditService
 from app.schemas.payment_receipt import (
     PaymentReceiptResponse,
@@ -28,7 +34,7 @@ router = APIRouter()
 
 @router.get("/", response_model=PaymentReceiptListResponse)
 def get_user_receipts(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     receipt_type: Optional[ReceiptType] = Query(None),
     status: Optional[ReceiptStatus] = Query(None),
@@ -39,10 +45,10 @@ def get_user_receipts(
     
     receipt_service = PaymentReceiptService(db)
     
-    receipts = receipt_service.get_user_receipts(
+    receipts, next_cursor = receipt_service.get_user_receipts(
         user_id=current_user.id,
         limit=limit,
-        offset=skip,
+        cursor=decode_cursor(cursor),
         receipt_type=receipt_type,
         status=status
     )
@@ -50,7 +56,8 @@ def get_user_receipts(
     return PaymentReceiptListResponse(
         receipts=[PaymentReceiptResponse.from_orm(r) for r in receipts],
         total_count=len(receipts),
-        has_more=len(receipts) == limit
+        has_more=next_cursor is not None,
+        next_cursor=encode_cursor(next_cursor)
     )
 
 
@@ -156,35 +163,33 @@ def generate_receipt_pdf(
         raise HTTPException(status_code=500, detail="Failed to generate PDF")
 
 
-@router.post("/{receipt_id}/send-email")
+@router.post("/{receipt_id}/send-email", status_code=202)
 def send_receipt_email(
     receipt_id: int,
     email_request: ReceiptEmailRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Send receipt via email."""
+    """Queue a receipt email; PDF generation and SMTP run in the background."""
     
     receipt_service = PaymentReceiptService(db)
     
-    try:
-        success = receipt_service.send_receipt_email(
-            receipt_id=receipt_id,
-            to_email=email_request.to_email,
-            user_id=current_user.id
-        )
-        
-        if success:
-            return {
-                "message": "Receipt sent successfully",
-                "email_sent": True,
-                "receipt_id": receipt_id
-            }
-        else:
-            raise HTTPException(status_code=500, detail="Failed to send email")
+    if not receipt_service.get_receipt_by_id(receipt_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Receipt not found")
     
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    background_tasks.add_task(
+        send_receipt_email_task,
+        receipt_id=receipt_id,
+        to_email=email_request.to_email,
+        user_id=current_user.id
+    )
+    
+    return {
+        "message": "Receipt email queued",
+        "email_queued": True,
+        "receipt_id": receipt_id
+    }
 
 
 @router.get("/{receipt_id}/download-url", response_model=ReceiptDownloadResponse)
@@ -231,7 +236,7 @@ def download_receipt_pdf(
     
     # Find and validate token
     download_token = db.query(SecureDownloadToken).filter(
-        SecureDownloadToken.token_plain == token
+        SecureDownloadToken.token_hash == hash_download_token(token)
     ).first()
     
     if not download_token or not download_token.is_valid:
@@ -255,12 +260,12 @@ def download_receipt_pdf(
     # Log audit event
     audit_service = AuditService(db)
     audit_service.log_action(
-        action="RECEIPT_PDF_DOWNLOADED",
+        action=AuditAction.RECEIPT_PDF_DOWNLOADED,
         user_id=download_token.user_id,
         description=f"Downloaded receipt PDF {receipt.receipt_number}",
         resource_type="receipt",
         resource_id=receipt.id,
-        metadata={
+        extra_data={
             "receipt_number": receipt.receipt_number,
             "download_token": token[:20] + "..."
         }
@@ -277,7 +282,7 @@ def download_receipt_pdf(
 # Admin endpoints
 @router.get("/admin/all", response_model=PaymentReceiptListResponse)
 def get_all_receipts_admin(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     receipt_type: Optional[ReceiptType] = Query(None),
     status: Optional[ReceiptStatus] = Query(None),
@@ -291,9 +296,9 @@ def get_all_receipts_admin(
     
     receipt_service = PaymentReceiptService(db)
     
-    receipts = receipt_service.get_all_receipts_for_admin(
+    receipts, next_cursor = receipt_service.get_all_receipts_for_admin(
         limit=limit,
-        offset=skip,
+        cursor=decode_cursor(cursor),
         receipt_type=receipt_type,
         status=status,
         user_id=user_id,
@@ -304,7 +309,61 @@ def get_all_receipts_admin(
     return PaymentReceiptListResponse(
         receipts=[PaymentReceiptResponse.from_orm(r) for r in receipts],
         total_count=len(receipts),
-        has_more=len(receipts) == limit
+        has_more=next_cursor is not None,
+        next_cursor=encode_cursor(next_cursor)
+    )
+
+
+# Columns written by the admin CSV export
+_EXPORT_COLUMNS = (
+    "id", "receipt_number", "receipt_type", "status", "user_id",
+    "customer_name", "customer_email", "amount", "tax_amount", "total_amount",
+    "currency", "payment_method", "transaction_id", "receipt_date",
+    "payment_date", "created_at"
+)
+
+
+@router.get("/admin/export")
+def export_receipts_admin(
+    receipt_type: Optional[ReceiptType] = Query(None),
+    status: Optional[ReceiptStatus] = Query(None),
+    user_id: Optional[int] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    current_admin: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Export matching payment receipts as CSV, streamed row by row."""
+    
+    receipt_service = PaymentReceiptService(db)
+    rows = receipt_service.iter_all_receipts_for_admin(
+        receipt_type=receipt_type,
+        status=status,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to
+    )
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(_EXPORT_COLUMNS)
+        for row in rows:
+            mapping = row._mapping
+            writer.writerow([
+                value.value if isinstance(value, Enum) else value
+                for value in (mapping[column] for column in _EXPORT_COLUMNS)
+            ])
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    
+    return StreamingResponse(
+        generate_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=receipts.csv"}
     )
 
 
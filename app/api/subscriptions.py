@@ -1,11 +1,11 @@
 """Subscription management API routes."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.subscription import SubscriptionResponse, SubscriptionCreate
+from app.schemas.subscription import SubscriptionResponse, SubscriptionCreate, SubscriptionListResponse
 from app.schemas.plan import PlanResponse
 from app.services.subscription_service import SubscriptionService
 from app.core.deps import get_current_active_user, get_current_admin_user
@@ -113,13 +113,23 @@ def get_usage_stats(
     }
 
 
-@router.get("/", response_model=List[SubscriptionResponse])
+@router.get("/", response_model=SubscriptionListResponse)
 def get_all_subscriptions(
-    skip: int = 0,
-    limit: int = 100,
+    after_id: Optional[int] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get all subscriptions (admin only)."""
+    """Get all subscriptions with keyset pagination (admin only)."""
     subscription_service = SubscriptionService(db)
-    return subscription_service.get_all_subscriptions(skip=skip, limit=limit)
\ No newline at end of file
+    subscriptions, next_after_id = subscription_service.get_all_subscriptions(
+        limit=limit,
+        after_id=after_id
+    )
+    
+    return SubscriptionListResponse(
+        subscriptions=[SubscriptionResponse.from_orm(s) for s in subscriptions],
+        total_count=len(subscriptions),
+        has_more=next_after_id is not None,
+        next_after_id=next_after_id
+    )
\ No newline at end of file
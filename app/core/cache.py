@@ -0,0 +1,143 @@
+"""Key/value cache backed by Redis, with an in-process fallback."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+try:
+    import redis
+except ImportError:  # Redis is optional; fall back to the local cache
+    redis = None
+
+
+class LocalCache:
+    """Process-local cache exposing the subset of the Redis API we use."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value stored at key, or None."""
+        with self._lock:
+            entry = self._get_entry(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> bool:
+        """Store value at key with an optional TTL in seconds."""
+        with self._lock:
+            if nx and self._get_entry(key) is not None:
+                return False
+            expires_at = time.monotonic() + ex if ex else None
+            self._data[key] = (str(value), expires_at)
+            return True
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Return the values stored at keys, with None for missing ones."""
+        with self._lock:
+            entries = [self._get_entry(key) for key in keys]
+            return [entry[0] if entry else None for entry in entries]
+    
+    def delete(self, *keys: str) -> int:
+        """Delete keys and return how many existed."""
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._get_entry(key) is not None:
+                    removed += 1
+                self._data.pop(key, None)
+            return removed
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Increment the integer stored at key, keeping its TTL."""
+        with self._lock:
+            entry = self._get_entry(key)
+            value, expires_at = entry if entry else ("0", None)
+            new_value = int(value) + amount
+            self._data[key] = (str(new_value), expires_at)
+            return new_value
+
+
+def _create_cache():
+    """Create the Redis client when configured, else the local cache."""
+    if settings.redis_url and redis is not None:
+        return redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return LocalCache()
+
+
+# Global cache instance
+cache = _create_cache()
+
+
+def cache_is_shared() -> bool:
+    """True when the cache is Redis, shared by all worker processes.
+    
+    The local fallback is per process, so an invalidation only reaches the
+    worker that made it; data that must not go stale skips it.
+    """
+    return not isinstance(cache, LocalCache)
+
+
+def cache_get(key: str) -> Optional[str]:
+    """Read a key, treating cache outages as a miss."""
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def cache_get_many(keys: List[str]) -> List[Optional[str]]:
+    """Read several keys in one round-trip, treating outages as misses."""
+    if not keys:
+        return []
+    try:
+        return cache.mget(keys)
+    except Exception:
+        return [None] * len(keys)
+
+
+def cache_set(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    """Write a key, ignoring cache outages."""
+    try:
+        cache.set(key, value, ex=ttl)
+    except Exception:
+        pass
+
+
+def cache_add(key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    """Set key only if absent (SETNX); True when this call created it.
+    
+    Cache outages report True so callers fail open.
+    """
+    try:
+        return bool(cache.set(key, value, ex=ttl, nx=True))
+    except Exception:
+        return True
+
+
+def cache_incr(key: str) -> None:
+    """Increment a counter key, ignoring cache outages."""
+    try:
+        cache.incr(key)
+    except Exception:
+        pass
+
+
+def cache_delete(*keys: str) -> None:
+    """Invalidate keys, ignoring cache outages."""
+    try:
+        cache.delete(*keys)
+    except Exception:
+        pass
@@ -0,0 +1,33 @@
+"""Keyset pagination cursor helpers for API endpoints."""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(cursor: Optional[Tuple[datetime, int]]) -> Optional[str]:
+    """Encode a (created_at, id) keyset cursor for the API.
+    
+    The cursor is base64url so the "+" in timezone offsets survives being
+    passed back in a query string without URL-encoding.
+    """
+    if not cursor:
+        return None
+    created_at, row_id = cursor
+    raw = f"{created_at.isoformat()}_{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode an API cursor back into a (created_at, id) tuple."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, row_id = raw.rpartition("_")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -13,13 +13,16 @@ from app.config import settings
 """Security utilities for authentication and authorization."""
 
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
+import base64
+import os
 import secrets
 import string
 import hashlib
 import hmac
+import threading
 
 from app.config import settings
 
@@ -112,6 +115,52 @@ def generate_reset_token() -> str:
     return ''.join(secrets.choice(alphabet) for _ in range(32))
 
 
+class PooledTokenGenerator:
+    """URL-safe token generator that amortizes os.urandom calls.
+    
+    Entropy is read from the OS in large blocks and sliced per token. The
+    pool is discarded in forked children so workers never share bytes.
+    """
+    
+    def __init__(self, token_bytes: int = 32, pool_size: int = 4096):
+        self.token_bytes = token_bytes
+        self.pool_size = pool_size
+        self._pool = b""
+        self._offset = 0
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._pool = b""
+        self._offset = 0
+    
+    def token(self) -> str:
+        """Return a new URL-safe token (base64url, no padding)."""
+        with self._lock:
+            if self._offset + self.token_bytes > len(self._pool):
+                self._pool = os.urandom(self.pool_size)
+                self._offset = 0
+            raw = self._pool[self._offset:self._offset + self.token_bytes]
+            self._offset += self.token_bytes
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+# Initialize the download token generator
+download_token_generator = PooledTokenGenerator()
+
+
+def hash_download_token(token: str) -> str:
+    """Hash a download token for storage and lookup."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def generate_download_token() -> Tuple[str, str]:
+    """Generate a secure download token and its SHA-256 hex digest."""
+    token_plain = download_token_generator.token()
+    return token_plain, hash_download_token(token_plain)
+
+
 def validate_password_strength(password: str) -> bool:
     """Validate password strength."""
     if len(password) < 8:
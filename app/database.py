@@ -1,20 +1,40 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
+import logging
+import time
 
 from app.config import settings
 
-# Create database engine
+logger = logging.getLogger(__name__)
+
+# Create database engine. Each gunicorn worker gets its own pool, so keep
+# workers * (pool_size + max_overflow) below Postgres' max_connections.
 engine = create_engine(
     settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_recycle=settings.db_pool_recycle,
     echo=settings.debug
 )
 
+_last_pool_stats_at = 0.0
+
+
+@event.listens_for(engine, "checkout")
+def _log_pool_stats(dbapi_connection, connection_record, connection_proxy):
+    """Periodically log connection pool usage on checkout."""
+    global _last_pool_stats_at
+    now = time.monotonic()
+    if now - _last_pool_stats_at >= settings.db_pool_stats_interval:
+        _last_pool_stats_at = now
+        logger.info("Database pool status: %s", engine.pool.status())
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -9,10 +9,14 @@ from fastapi.responses import JSONResponse
 import os
 
 from app.config import settings
+from app.core.logging_config import setup_logging, shutdown_logging
 from app.database import create_tables
 from app.api import auth, users, subscriptions, invoices, files, settings as settings_api, webhooks
 from app.web.routes import router as web_router
 
+# Configure non-blocking logging before anything starts emitting records
+setup_logging()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
@@ -164,6 +168,17 @@ async def startup_event():
         print(f"Error in startup event: {e}")
         # Don't raise the exception to prevent app from failing to start
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending audit rows and log records and stop PDF workers on shutdown."""
+    from app.services.audit_service import shutdown_audit_writer
+    from app.services.pdf_service import shutdown_pdf_executor
+    
+    shutdown_audit_writer()
+    shutdown_pdf_executor()
+    shutdown_logging()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -9,6 +9,7 @@ from .invoice import Invoice
 from .invoice_item import InvoiceItem
 from .payment import Payment
 from .payment_receipt import PaymentReceipt
+from .receipt_sequence import ReceiptSequence
 from .razorpay_event import RazorpayEvent
 from .file_asset import FileAsset
 from .notification import Notification
@@ -29,6 +30,7 @@ __all__ = [
     "InvoiceItem", 
     "Payment",
     "PaymentReceipt",
+    "ReceiptSequence",
     "RazorpayEvent",
     "FileAsset",
     "Notification",
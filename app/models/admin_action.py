@@ -14,6 +14,7 @@ class AdminActionType(str, enum.Enum):
     SUBSCRIPTION_MANAGEMENT = "subscription_management"
     INVOICE_MANAGEMENT = "invoice_management"
     PAYMENT_MANAGEMENT = "payment_management"
+    RECEIPT_MANAGEMENT = "receipt_management"
     SYSTEM_CONFIGURATION = "system_configuration"
     ANALYTICS_ACCESS = "analytics_access"
     BULK_OPERATION = "bulk_operation"
@@ -43,6 +43,14 @@ class AuditAction(str, enum.Enum):
     PAYMENT_FAILED = "payment_failed"
     PAYMENT_REFUNDED = "payment_refunded"
     
+    # Receipt actions
+    RECEIPT_CREATED = "receipt_created"
+    RECEIPTS_BULK_CREATED = "receipts_bulk_created"
+    RECEIPT_PDF_GENERATED = "receipt_pdf_generated"
+    RECEIPT_SENT = "receipt_sent"
+    RECEIPT_PDF_DOWNLOADED = "receipt_pdf_downloaded"
+    RECEIPT_UPDATED = "receipt_updated"
+    
     # Admin actions
     ADMIN_USER_VIEWED = "admin_user_viewed"
     ADMIN_USER_DEACTIVATED = "admin_user_deactivated"
@@ -1,6 +1,7 @@
 """Notification model for user notifications."""
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, Index, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -35,6 +36,9 @@ class Notification(Base):
     """Notification model for user notifications."""
     
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -57,7 +61,7 @@ class Notification(Base):
     read_at = Column(DateTime, nullable=True)
     
     # Additional data
-    extra_data = Column(Text, nullable=True)  # JSON string for additional data
+    extra_data = Column("metadata", JSON().with_variant(JSONB, "postgresql"), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -65,5 +69,24 @@ class Notification(Base):
     # Relationships
     user = relationship("User", back_populates="notifications")
     
+    # Owner's "mark all read" watermark, attached by NotificationService
+    # when loading rows (not a column)
+    last_read_at = None
+    
+    # Related invoice/subscription, attached by
+    # NotificationService.get_user_notifications_with_resources (not a column)
+    resource = None
+    
+    @property
+    def is_read(self) -> bool:
+        """Read explicitly, or created before the user last marked all as read."""
+        if self.read_at is not None:
+            return True
+        return (
+            self.last_read_at is not None
+            and self.created_at is not None
+            and self.created_at <= self.last_read_at
+        )
+    
     def __repr__(self):
         return f"<Notification(id={self.id}, user_id={self.user_id}, type='{self.type}', status='{self.status}')>"
\ No newline at end of file
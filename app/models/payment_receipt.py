@@ -1,6 +1,6 @@
 """Payment receipt model for storing receipt data and metadata."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -29,6 +29,13 @@ class PaymentReceipt(Base):
     """Payment receipt model."""
     
     __tablename__ = "payment_receipts"
+    __table_args__ = (
+        Index("ix_payment_receipts_user_created", "user_id", "created_at", "id"),
+        Index("ix_payment_receipts_user_type_status_created", "user_id", "receipt_type", "status", "created_at"),
+        Index("ix_payment_receipts_created", "created_at", "id"),
+        # At most one receipt per payment
+        Index("uq_payment_receipts_payment_id", "payment_id", unique=True),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,17 @@
+"""Receipt sequence model for allocating monthly receipt numbers."""
+
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class ReceiptSequence(Base):
+    """Per-month receipt number counter, incremented atomically via UPSERT."""
+    
+    __tablename__ = "receipt_sequences"
+    
+    year_month = Column(String(6), primary_key=True)  # YYYYMM
+    last_seq = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ReceiptSequence(year_month='{self.year_month}', last_seq={self.last_seq})>"
@@ -20,7 +20,10 @@ class SecureDownloadToken(Base):
     
     # Token details
     token_hash = Column(String(255), nullable=False, unique=True, index=True)
-    token_plain = Column(String(255), nullable=False)  # Store plain token temporarily
+    
+    # Plain token, set on freshly generated tokens so callers can build the
+    # download link; only the hash is persisted
+    token_plain = None
     
     # Token configuration
     expires_at = Column(DateTime, nullable=False)
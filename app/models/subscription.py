@@ -39,7 +39,7 @@ class Subscription(Base):
     
     # Relationships
     user = relationship("User", back_populates="subscriptions")
-    plan = relationship("Plan", back_populates="subscriptions")
+    plan = relationship("Plan", back_populates="subscriptions", lazy="joined")
     payments = relationship("Payment", back_populates="subscription")
     payment_receipts = relationship("PaymentReceipt", back_populates="subscription")
     
@@ -1,6 +1,6 @@
 """Template model for managing invoice and receipt templates."""
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,11 +19,15 @@ class Template(Base):
     """Template model for invoice and receipt templates."""
     
     __tablename__ = "templates"
+    __table_args__ = (
+        # Invoice and receipt templates may share a template_id
+        Index("uq_templates_category_template_id", "category", "template_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Template identification
-    template_id = Column(String(50), unique=True, nullable=False, index=True)
+    template_id = Column(String(50), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     category = Column(Enum(TemplateCategory), nullable=False)
     
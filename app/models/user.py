@@ -29,6 +29,7 @@ class User(Base):
     verification_token = Column(String(255), nullable=True)
     reset_token = Column(String(255), nullable=True)
     reset_token_expires = Column(DateTime, nullable=True)
+    notifications_last_read_at = Column(DateTime(timezone=True), nullable=True)  # "mark all read" watermark
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
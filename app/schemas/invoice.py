@@ -100,4 +100,8 @@ class InvoiceListResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class InvoiceBulkPDFRequest(BaseModel):
+    """Schema for generating PDFs for several invoices at once."""
+    invoice_ids: List[int] = Field(..., min_length=1, max_length=100)
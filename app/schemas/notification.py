@@ -2,7 +2,7 @@
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 from app.models.notification import NotificationType, NotificationStatus
 
@@ -39,16 +39,15 @@ class NotificationResponse(NotificationBase):
     read_at: Optional[datetime]
     created_at: datetime
     updated_at: Optional[datetime]
-    
-    @property
-    def is_read(self) -> bool:
-        """Check if notification is read."""
-        return self.read_at is not None
+    metadata: Optional[Dict[str, Any]] = Field(
+        None, validation_alias=AliasChoices("extra_data", "metadata")
+    )
+    is_read: bool = False
     
     @property
     def is_unread(self) -> bool:
         """Check if notification is unread."""
-        return self.read_at is None
+        return not self.is_read
     
     class Config:
         from_attributes = True
@@ -60,6 +59,7 @@ class NotificationListResponse(BaseModel):
     total_count: int
     unread_count: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 class NotificationStatsResponse(BaseModel):
@@ -133,6 +133,7 @@ class PaymentReceiptListResponse(BaseModel):
     receipts: List[PaymentReceiptResponse]
     total_count: int
     has_more: bool
+    next_cursor: Optional[str] = None
 
 
 class PaymentReceiptStatsResponse(BaseModel):
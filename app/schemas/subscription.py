@@ -1,7 +1,7 @@
 """Subscription schemas."""
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.models.subscription import SubscriptionStatus
@@ -25,4 +25,12 @@ class SubscriptionResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class SubscriptionListResponse(BaseModel):
+    """Schema for paginated subscription list responses."""
+    subscriptions: List[SubscriptionResponse]
+    total_count: int
+    has_more: bool
+    next_after_id: Optional[int] = None
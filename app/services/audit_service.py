@@ -1,15 +1,92 @@
 """Audit service for logging and querying user and admin actions."""
 
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, insert
 import json
+import logging
+import queue
+import threading
 
+from app.database import SessionLocal
 from app.models.audit_log import AuditLog, AuditAction
 from app.models.admin_action import AdminAction, AdminActionType
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
+# Background audit writer: rows are queued by the *_async methods and
+# written in batches on a dedicated thread with its own session.
+_AUDIT_BATCH_SIZE = 100
+_AUDIT_FLUSH_INTERVAL = 0.5  # seconds
+_audit_queue: "queue.Queue" = queue.Queue()
+_audit_writer: Optional[threading.Thread] = None
+_audit_writer_lock = threading.Lock()
+
+
+def _write_audit_rows(rows) -> None:
+    """Insert queued (model, values) rows, one executemany per model."""
+    rows_by_model = defaultdict(list)
+    for model, values in rows:
+        rows_by_model[model].append(values)
+    
+    db = SessionLocal()
+    try:
+        for model, values_list in rows_by_model.items():
+            db.execute(insert(model), values_list)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to write %d audit rows", len(rows))
+    finally:
+        db.close()
+
+
+def _audit_writer_loop() -> None:
+    """Drain the audit queue, batching rows that arrive close together."""
+    while True:
+        item = _audit_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        stop = False
+        while len(batch) < _AUDIT_BATCH_SIZE:
+            try:
+                item = _audit_queue.get(timeout=_AUDIT_FLUSH_INTERVAL)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        _write_audit_rows(batch)
+        if stop:
+            return
+
+
+def _enqueue_audit_row(model, values: Dict[str, Any]) -> None:
+    """Queue a row for the background writer, starting it on first use."""
+    global _audit_writer
+    if _audit_writer is None or not _audit_writer.is_alive():
+        with _audit_writer_lock:
+            if _audit_writer is None or not _audit_writer.is_alive():
+                _audit_writer = threading.Thread(
+                    target=_audit_writer_loop, name="audit-writer", daemon=True
+                )
+                _audit_writer.start()
+    _audit_queue.put((model, values))
+
+
+def shutdown_audit_writer(timeout: float = 5.0) -> None:
+    """Flush queued audit rows and stop the background writer."""
+    global _audit_writer
+    if _audit_writer is not None and _audit_writer.is_alive():
+        _audit_queue.put(None)
+        _audit_writer.join(timeout)
+    _audit_writer = None
+
 
 class AuditService:
     """Service for audit logging and querying."""
@@ -115,6 +192,23 @@ class AuditService:
             extra_data=json.dumps(extra_data) if extra_data else None
         )
     
+    def log_action_async(self, action: str, user_id: int = None, description: str = None,
+                         resource_type: str = None, resource_id: int = None,
+                         ip_address: str = None, user_agent: str = None,
+                         extra_data: Dict[str, Any] = None):
+        """Queue an action log entry without blocking on the INSERT."""
+        _enqueue_audit_row(AuditLog, {
+            "action": action,
+            "user_id": user_id,
+            "description": description,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "extra_data": json.dumps(extra_data, default=str) if extra_data else None,
+            "success": "success"
+        })
+    
     # Admin action logging
     def log_admin_action(self, admin_id: int, action_type: AdminActionType, 
                         action_name: str, description: str,
@@ -155,6 +249,39 @@ class AuditService:
         
         return admin_action
     
+    def log_admin_action_async(self, admin_id: int, action_type: AdminActionType,
+                               action_name: str, description: str,
+                               target_user_id: int = None, target_resource_type: str = None,
+                               target_resource_id: int = None, ip_address: str = None,
+                               user_agent: str = None, operation_data: Dict[str, Any] = None):
+        """Queue an admin action (and its audit log entry) without blocking."""
+        now = datetime.utcnow()
+        _enqueue_audit_row(AdminAction, {
+            "admin_id": admin_id,
+            "action_type": action_type,
+            "action_name": action_name,
+            "description": description,
+            "target_user_id": target_user_id,
+            "target_resource_type": target_resource_type,
+            "target_resource_id": target_resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "operation_data": json.dumps(operation_data, default=str) if operation_data else None,
+            "started_at": now,
+            "completed_at": now,
+            "status": "completed"
+        })
+        _enqueue_audit_row(AuditLog, {
+            "action": AuditAction.ADMIN_USER_VIEWED if "view" in action_name.lower() else AuditAction.ADMIN_USER_DEACTIVATED,
+            "admin_id": admin_id,
+            "description": f"Admin action: {description}",
+            "resource_type": target_resource_type,
+            "resource_id": target_resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "success": "success"
+        })
+    
     # Query methods
     def get_user_audit_logs(self, user_id: int, limit: int = 50, offset: int = 0) -> List[AuditLog]:
         """Get audit logs for a specific user."""
@@ -12,8 +12,6 @@ from datetime import datetime, timedelta
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 import json
 import os
-import hashlib
-import secrets
 
 from app.models.email_log import EmailLog, EmailType, EmailStatus
 from app.models.notification import Notification, NotificationType, NotificationStatus
@@ -21,6 +19,16 @@ from app.models.secure_download_token import SecureDownloadToken
 from app.models.user import User
 from app.models.invoice import Invoice
 from app.config import settings
+from app.core.security import generate_download_token
+
+# Shared Jinja2 environment for email templates. Its template cache keeps
+# compiled templates across EmailService instances instead of recompiling
+# them per request; mtime checks are only needed while developing.
+_email_jinja_env = Environment(
+    loader=FileSystemLoader('app/templates/email'),
+    autoescape=select_autoescape(['html', 'xml']),
+    auto_reload=settings.debug
+)
 
 
 class EmailService:
@@ -33,12 +41,7 @@ class EmailService:
         self.smtp_user = settings.smtp_user
         self.smtp_password = settings.smtp_password
         self.from_email = settings.from_email
-        
-        # Setup Jinja2 environment for email templates
-        self.jinja_env = Environment(
-            loader=FileSystemLoader('app/templates/email'),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        self.jinja_env = _email_jinja_env
     
     def send_email(
         self,
@@ -398,15 +401,13 @@ class EmailService:
         """Generate secure download token for invoice PDF."""
         
         # Generate token
-        token_plain = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(token_plain.encode()).hexdigest()
+        token_plain, token_hash = generate_download_token()
         
         # Create token record
         download_token = SecureDownloadToken(
             user_id=user_id,
             invoice_id=invoice_id,
             token_hash=token_hash,
-            token_plain=token_plain,
             expires_at=datetime.utcnow() + timedelta(hours=24),  # 24 hour expiry
             max_downloads=5
         )
@@ -414,6 +415,7 @@ class EmailService:
         self.db.add(download_token)
         self.db.commit()
         
+        download_token.token_plain = token_plain
         return download_token
     
     def _create_notification(
@@ -96,8 +96,7 @@ class FileService:
         
         # Delete physical file
         try:
-            if os.path.exists(file_asset.file_path):
-                os.remove(file_asset.file_path)
+            os.unlink(file_asset.file_path)
         except Exception:
             pass  # Continue even if file deletion fails
         
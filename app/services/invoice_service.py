@@ -143,8 +143,11 @@ class InvoiceService:
             raise ValueError("Can only delete draft invoices")
         
         # Delete PDF file if exists
-        if invoice.pdf_file_path and os.path.exists(invoice.pdf_file_path):
-            os.remove(invoice.pdf_file_path)
+        if invoice.pdf_file_path:
+            try:
+                os.unlink(invoice.pdf_file_path)
+            except FileNotFoundError:
+                pass
         
         self.db.delete(invoice)
         self.db.commit()
@@ -162,6 +165,9 @@ class InvoiceService:
         invoice.status = InvoiceStatus.FINALIZED
         self.db.commit()
         
+        # Finalized invoices count towards the monthly limit
+        self.subscription_service.invalidate_invoice_count(user_id, invoice.created_at)
+        
         # Log audit event
         self.audit_service.log_invoice_finalized(
             user_id=user_id,
@@ -1,23 +1,111 @@
 """Notification service for managing user notifications."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import Text, bindparam, cast, delete, or_, select, tuple_
+from sqlalchemy.sql import func
 from sqlalchemy.orm import Session
-from datetime import datetime
+from collections import defaultdict
+from functools import cached_property
+from datetime import datetime, timedelta
 import json
+import logging
 
 from app.models.notification import Notification, NotificationType, NotificationStatus
 from app.models.user import User
 from app.models.invoice import Invoice
 from app.models.subscription import Subscription
 from app.services.email_service import EmailService
+from app.core.cache import cache_get, cache_set, cache_add, cache_delete
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Notification types that trigger an email
+_EMAIL_NOTIFICATION_TYPES = frozenset((
+    NotificationType.SUBSCRIPTION_ACTIVATED,
+    NotificationType.SUBSCRIPTION_CANCELLED,
+    NotificationType.SUBSCRIPTION_RENEWED,
+    NotificationType.ADMIN_MESSAGE,
+))
+
+# Subscription email template variant per notification type
+_SUBSCRIPTION_EMAIL_TYPES = {
+    NotificationType.SUBSCRIPTION_ACTIVATED: "activated",
+    NotificationType.SUBSCRIPTION_CANCELLED: "cancelled",
+    NotificationType.SUBSCRIPTION_RENEWED: "renewed",
+}
+
+# Models backing Notification.resource_type values
+_RESOURCE_MODELS = {
+    "invoice": Invoice,
+    "subscription": Subscription,
+}
+
+# Notification message copy
+_INVOICE_FINALIZED_MSG = "Invoice {number} has been finalized and is ready to send."
+_INVOICE_SENT_MSG = "Invoice {number} has been sent to {client}."
+_INVOICE_PAID_MSG = "Invoice {number} has been marked as paid."
+_SUBSCRIPTION_ACTIVATED_MSG = "Your {plan} subscription has been activated."
+_SUBSCRIPTION_CANCELLED_MSG = "Your {plan} subscription has been cancelled."
+_SUBSCRIPTION_RENEWED_MSG = "Your {plan} subscription has been renewed."
+
+
+def _invoice_metadata(invoice: Invoice) -> Dict[str, Any]:
+    """Metadata shared by invoice notifications."""
+    return {
+        "invoice_number": invoice.invoice_number,
+        "client_name": invoice.client_name,
+        "amount": str(invoice.grand_total),
+        "currency": invoice.currency
+    }
+
+
+def _unread_count_key(user_id: int) -> str:
+    """Cache key for a user's unread notification count."""
+    return f"notifications:unread:{user_id}"
+
+
+def _last_read_at_subquery(user_id):
+    """Scalar subquery for the user's "mark all read" watermark."""
+    return select(User.notifications_last_read_at).where(
+        User.id == user_id
+    ).scalar_subquery()
+
+
+def _unread_filters(user_id) -> tuple:
+    """Filters matching a user's unread notifications.
+    
+    A notification is unread when it has no read_at stamp and was created
+    after the user's last "mark all read".
+    """
+    last_read_at = _last_read_at_subquery(user_id)
+    return (
+        Notification.user_id == user_id,
+        Notification.read_at.is_(None),
+        or_(last_read_at.is_(None), Notification.created_at > last_read_at)
+    )
+
+
+def _email_dedup_key(notification: Notification) -> str:
+    """Cache key identifying equivalent notification emails."""
+    return f"notifications:dedup:{notification.user_id}:{notification.type.value}:{notification.resource_id}"
 
 
 class NotificationService:
-    """Service class for notification operations."""
+    """Service class for notification operations.
+    
+    Methods such as notify_invoice_sent keep their session (and pooled
+    connection) checked out while emails are dispatched, so the engine pool
+    in app.database is sized to absorb that under concurrent load.
+    """
     
     def __init__(self, db: Session):
         self.db = db
-        self.email_service = EmailService(db)
+    
+    @cached_property
+    def email_service(self) -> EmailService:
+        """Email service, built only when a notification actually sends mail."""
+        return EmailService(self.db)
     
     def create_notification(
         self,
@@ -32,6 +120,7 @@ class NotificationService:
     ) -> Notification:
         """Create a new notification."""
         
+        now = datetime.utcnow()
         notification = Notification(
             user_id=user_id,
             type=notification_type,
@@ -39,24 +128,79 @@ class NotificationService:
             message=message,
             resource_type=resource_type,
             resource_id=resource_id,
-            metadata=json.dumps(metadata) if metadata else None,
+            extra_data=metadata or None,
             status=NotificationStatus.PENDING
         )
         
         self.db.add(notification)
         self.db.flush()
         
-        # Send email notification if requested
-        if send_email:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if user:
-                self._send_notification_email(user, notification)
+        # Send email notification if requested, collapsing equivalent
+        # notifications fired within the dedup window into one email
+        if send_email and notification_type in _EMAIL_NOTIFICATION_TYPES:
+            dedup_key = _email_dedup_key(notification)
+            if cache_add(dedup_key, 1, ttl=settings.notification_email_dedup_window):
+                user = self.db.get(User, user_id)
+                if user:
+                    self._send_notification_email(user, notification, now)
+                
+                # Release the claim so a retry can still send the email
+                if notification.status == NotificationStatus.FAILED:
+                    cache_delete(dedup_key)
         
-        notification.status = NotificationStatus.SENT
+        if notification.status != NotificationStatus.FAILED:
+            notification.status = NotificationStatus.SENT
         self.db.commit()
+        cache_delete(_unread_count_key(user_id))
         
         return notification
     
+    def create_notifications_bulk(
+        self,
+        user_ids: List[int],
+        notification_type: NotificationType,
+        title: str,
+        message: str,
+        resource_type: str = None,
+        resource_id: int = None,
+        metadata: Dict[str, Any] = None
+    ) -> int:
+        """Create the same notification for many users in one INSERT.
+        
+        Intended for broadcast fan-out such as admin announcements; no emails
+        are sent. The metadata is encoded to JSON once and bound as text for
+        every row instead of being re-encoded per recipient.
+        """
+        
+        if not user_ids:
+            return 0
+        
+        metadata_json = json.dumps(metadata, separators=(",", ":")) if metadata else None
+        metadata_column = Notification.__mapper__.c.extra_data
+        
+        stmt = Notification.__table__.insert().values({
+            metadata_column: cast(bindparam("metadata_json", type_=Text), metadata_column.type)
+        })
+        rows = [
+            {
+                "user_id": user_id,
+                "type": notification_type,
+                "status": NotificationStatus.SENT,
+                "title": title,
+                "message": message,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "metadata_json": metadata_json
+            }
+            for user_id in user_ids
+        ]
+        
+        self.db.execute(stmt, rows)
+        self.db.commit()
+        cache_delete(*(_unread_count_key(user_id) for user_id in user_ids))
+        
+        return len(rows)
+    
     def notify_invoice_finalized(self, invoice: Invoice) -> Notification:
         """Send notification when invoice is finalized."""
         
@@ -64,15 +208,10 @@ class NotificationService:
             user_id=invoice.user_id,
             notification_type=NotificationType.INVOICE_FINALIZED,
             title="Invoice Finalized",
-            message=f"Invoice {invoice.invoice_number} has been finalized and is ready to send.",
+            message=_INVOICE_FINALIZED_MSG.format(number=invoice.invoice_number),
             resource_type="invoice",
             resource_id=invoice.id,
-            metadata={
-                "invoice_number": invoice.invoice_number,
-                "client_name": invoice.client_name,
-                "amount": str(invoice.grand_total),
-                "currency": invoice.currency
-            }
+            metadata=_invoice_metadata(invoice)
         )
     
     def notify_invoice_sent(self, invoice: Invoice) -> List[Notification]:
@@ -85,16 +224,10 @@ class NotificationService:
             user_id=invoice.user_id,
             notification_type=NotificationType.INVOICE_SENT,
             title="Invoice Sent",
-            message=f"Invoice {invoice.invoice_number} has been sent to {invoice.client_name}.",
+            message=_INVOICE_SENT_MSG.format(number=invoice.invoice_number, client=invoice.client_name),
             resource_type="invoice",
             resource_id=invoice.id,
-            metadata={
-                "invoice_number": invoice.invoice_number,
-                "client_name": invoice.client_name,
-                "client_email": invoice.client_email,
-                "amount": str(invoice.grand_total),
-                "currency": invoice.currency
-            }
+            metadata={**_invoice_metadata(invoice), "client_email": invoice.client_email}
         )
         notifications.append(user_notification)
         
@@ -117,15 +250,10 @@ class NotificationService:
             user_id=invoice.user_id,
             notification_type=NotificationType.INVOICE_PAID,
             title="Invoice Paid",
-            message=f"Invoice {invoice.invoice_number} has been marked as paid.",
+            message=_INVOICE_PAID_MSG.format(number=invoice.invoice_number),
             resource_type="invoice",
             resource_id=invoice.id,
-            metadata={
-                "invoice_number": invoice.invoice_number,
-                "client_name": invoice.client_name,
-                "amount": str(invoice.grand_total),
-                "currency": invoice.currency
-            }
+            metadata=_invoice_metadata(invoice)
         )
         
         # Send email notification
@@ -142,16 +270,17 @@ class NotificationService:
     def notify_subscription_activated(self, subscription: Subscription) -> Notification:
         """Send notification when subscription is activated."""
         
+        plan = subscription.plan
         return self.create_notification(
             user_id=subscription.user_id,
             notification_type=NotificationType.SUBSCRIPTION_ACTIVATED,
             title="Subscription Activated",
-            message=f"Your {subscription.plan.name} subscription has been activated.",
+            message=_SUBSCRIPTION_ACTIVATED_MSG.format(plan=plan.name),
             resource_type="subscription",
             resource_id=subscription.id,
             metadata={
-                "plan_name": subscription.plan.name,
-                "plan_price": str(subscription.plan.price),
+                "plan_name": plan.name,
+                "plan_price": str(plan.price),
                 "current_period_end": subscription.current_period_end.isoformat() if subscription.current_period_end else None
             }
         )
@@ -159,15 +288,16 @@ class NotificationService:
     def notify_subscription_cancelled(self, subscription: Subscription) -> Notification:
         """Send notification when subscription is cancelled."""
         
+        plan = subscription.plan
         return self.create_notification(
             user_id=subscription.user_id,
             notification_type=NotificationType.SUBSCRIPTION_CANCELLED,
             title="Subscription Cancelled",
-            message=f"Your {subscription.plan.name} subscription has been cancelled.",
+            message=_SUBSCRIPTION_CANCELLED_MSG.format(plan=plan.name),
             resource_type="subscription",
             resource_id=subscription.id,
             metadata={
-                "plan_name": subscription.plan.name,
+                "plan_name": plan.name,
                 "cancelled_at": subscription.cancelled_at.isoformat() if subscription.cancelled_at else None,
                 "current_period_end": subscription.current_period_end.isoformat() if subscription.current_period_end else None
             }
@@ -176,16 +306,17 @@ class NotificationService:
     def notify_subscription_renewed(self, subscription: Subscription) -> Notification:
         """Send notification when subscription is renewed."""
         
+        plan = subscription.plan
         return self.create_notification(
             user_id=subscription.user_id,
             notification_type=NotificationType.SUBSCRIPTION_RENEWED,
             title="Subscription Renewed",
-            message=f"Your {subscription.plan.name} subscription has been renewed.",
+            message=_SUBSCRIPTION_RENEWED_MSG.format(plan=plan.name),
             resource_type="subscription",
             resource_id=subscription.id,
             metadata={
-                "plan_name": subscription.plan.name,
-                "plan_price": str(subscription.plan.price),
+                "plan_name": plan.name,
+                "plan_price": str(plan.price),
                 "current_period_start": subscription.current_period_start.isoformat() if subscription.current_period_start else None,
                 "current_period_end": subscription.current_period_end.isoformat() if subscription.current_period_end else None
             }
@@ -243,17 +374,78 @@ class NotificationService:
         self,
         user_id: int,
         limit: int = 50,
-        offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
         unread_only: bool = False
-    ) -> List[Notification]:
-        """Get notifications for a user."""
+    ) -> Tuple[List[Notification], Optional[Tuple[datetime, int]]]:
+        """Get a page of notifications for a user, newest first.
+        
+        Uses keyset pagination on (created_at, id): pass the returned cursor
+        back in to fetch the next page. The cursor is None on the last page.
+        """
         
         query = self.db.query(Notification).filter(Notification.user_id == user_id)
         
         if unread_only:
-            query = query.filter(Notification.read_at.is_(None))
+            query = query.filter(*_unread_filters(user_id))
+        
+        if cursor:
+            query = query.filter(tuple_(Notification.created_at, Notification.id) < cursor)
+        
+        notifications = query.order_by(
+            Notification.created_at.desc(),
+            Notification.id.desc()
+        ).limit(limit).all()
+        
+        last_read_at = self.db.query(User.notifications_last_read_at).filter(
+            User.id == user_id
+        ).scalar()
+        for notification in notifications:
+            notification.last_read_at = last_read_at
+        
+        next_cursor = None
+        if len(notifications) == limit:
+            last = notifications[-1]
+            next_cursor = (last.created_at, last.id)
+        
+        return notifications, next_cursor
+    
+    def get_user_notifications_with_resources(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        unread_only: bool = False
+    ) -> Tuple[List[Notification], Optional[Tuple[datetime, int]]]:
+        """Get a page of notifications with their related resources attached.
+        
+        Resources are fetched with one IN query per resource type rather than
+        one lazy load per notification, and exposed as notification.resource.
+        """
+        
+        notifications, next_cursor = self.get_user_notifications(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+            unread_only=unread_only
+        )
+        
+        ids_by_type = defaultdict(set)
+        for notification in notifications:
+            if notification.resource_type in _RESOURCE_MODELS and notification.resource_id:
+                ids_by_type[notification.resource_type].add(notification.resource_id)
+        
+        resources = {}
+        for resource_type, ids in ids_by_type.items():
+            model = _RESOURCE_MODELS[resource_type]
+            for resource in self.db.query(model).filter(model.id.in_(ids)).all():
+                resources[(resource_type, resource.id)] = resource
+        
+        for notification in notifications:
+            notification.resource = resources.get(
+                (notification.resource_type, notification.resource_id)
+            )
         
-        return query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
+        return notifications, next_cursor
     
     def mark_notification_as_read(self, notification_id: int, user_id: int) -> Optional[Notification]:
         """Mark a notification as read."""
@@ -267,79 +459,81 @@ class NotificationService:
             notification.read_at = datetime.utcnow()
             notification.status = NotificationStatus.READ
             self.db.commit()
+            cache_delete(_unread_count_key(user_id))
         
         return notification
     
     def mark_all_notifications_as_read(self, user_id: int) -> int:
-        """Mark all notifications as read for a user."""
-        
-        count = self.db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read_at.is_(None)
-        ).update({
-            "read_at": datetime.utcnow(),
-            "status": NotificationStatus.READ
-        })
+        """Mark all notifications as read for a user.
+        
+        Moves the user's read watermark instead of stamping every unread
+        row, so the write is O(1) regardless of notification volume.
+        """
+        
+        count = self.get_unread_count(user_id)
+        
+        self.db.query(User).filter(User.id == user_id).update(
+            {"notifications_last_read_at": func.now()},
+            synchronize_session=False
+        )
         
         self.db.commit()
+        cache_set(_unread_count_key(user_id), 0, ttl=settings.unread_count_cache_ttl)
         return count
     
     def get_unread_count(self, user_id: int) -> int:
-        """Get count of unread notifications for a user."""
+        """Get count of unread notifications for a user (cached)."""
         
-        return self.db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.read_at.is_(None)
-        ).count()
+        cache_key = _unread_count_key(user_id)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return int(cached)
+        
+        count = self.db.query(Notification).filter(*_unread_filters(user_id)).count()
+        
+        cache_set(cache_key, count, ttl=settings.unread_count_cache_ttl)
+        return count
     
-    def _send_notification_email(self, user: User, notification: Notification):
+    def _send_notification_email(self, user: User, notification: Notification, now: datetime = None):
         """Send email for notification (if applicable)."""
         
         # Only send emails for certain notification types
-        email_types = [
-            NotificationType.SUBSCRIPTION_ACTIVATED,
-            NotificationType.SUBSCRIPTION_CANCELLED,
-            NotificationType.SUBSCRIPTION_RENEWED,
-            NotificationType.ADMIN_MESSAGE
-        ]
-        
-        if notification.type in email_types:
-            try:
-                # Use appropriate email template based on notification type
-                if notification.type == NotificationType.SUBSCRIPTION_ACTIVATED:
-                    self.email_service.send_subscription_notification(
-                        user=user,
-                        subscription_type="activated",
-                        subscription_data=json.loads(notification.metadata) if notification.metadata else {}
-                    )
-                elif notification.type == NotificationType.SUBSCRIPTION_CANCELLED:
-                    self.email_service.send_subscription_notification(
-                        user=user,
-                        subscription_type="cancelled",
-                        subscription_data=json.loads(notification.metadata) if notification.metadata else {}
-                    )
-                elif notification.type == NotificationType.SUBSCRIPTION_RENEWED:
-                    self.email_service.send_subscription_notification(
-                        user=user,
-                        subscription_type="renewed",
-                        subscription_data=json.loads(notification.metadata) if notification.metadata else {}
-                    )
-                
-                notification.email_sent = True
-                notification.email_sent_at = datetime.utcnow()
-                
-            except Exception as e:
-                print(f"Failed to send notification email: {e}")
+        if notification.type not in _EMAIL_NOTIFICATION_TYPES:
+            return
+        
+        try:
+            # Use appropriate email template based on notification type
+            subscription_type = _SUBSCRIPTION_EMAIL_TYPES.get(notification.type)
+            if subscription_type:
+                self.email_service.send_subscription_notification(
+                    user=user,
+                    subscription_type=subscription_type,
+                    subscription_data=notification.extra_data or {}
+                )
+            
+            notification.email_sent = True
+            notification.email_sent_at = now or datetime.utcnow()
+        except Exception:
+            notification.status = NotificationStatus.FAILED
+            logger.exception(
+                "Failed to send notification email",
+                extra={"notification_id": notification.id, "user_id": user.id}
+            )
     
     def cleanup_old_notifications(self, days: int = 90) -> int:
         """Clean up old notifications."""
         
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        count = self.db.query(Notification).filter(
+        last_read_at = _last_read_at_subquery(Notification.user_id)
+        stmt = delete(Notification).where(
             Notification.created_at < cutoff_date,
-            Notification.status == NotificationStatus.READ
-        ).delete()
+            or_(
+                Notification.status == NotificationStatus.READ,
+                Notification.created_at <= last_read_at
+            )
+        ).execution_options(synchronize_session=False)
         
+        result = self.db.execute(stmt)
         self.db.commit()
-        return count
\ No newline at end of file
+        return result.rowcount
\ No newline at end of file
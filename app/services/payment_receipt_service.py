@@ -1,37 +1,119 @@
 """Payment receipt service for managing payment receipts and PDF generation."""
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple
+from sqlalchemy import Row, case, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
 from decimal import Decimal
+from functools import cached_property, lru_cache
+import logging
 import os
-import secrets
-import hashlib
 
+from app.database import SessionLocal
 from app.models.payment_receipt import PaymentReceipt, ReceiptStatus, ReceiptType
-from app.models.payment import Payment
+from app.models.receipt_sequence import ReceiptSequence
+from app.models.payment import Payment, PaymentStatus
 from app.models.subscription import Subscription
 from app.models.invoice import Invoice
 from app.models.user import User
+from app.models.audit_log import AuditAction
+from app.models.admin_action import AdminActionType
 from app.models.company_profile import CompanyProfile
 from app.models.secure_download_token import SecureDownloadToken
 from app.services.pdf_service import PDFService
 from app.services.audit_service import AuditService
 from app.services.notification_service import NotificationService
 from app.services.email_service import EmailService
-from app.schemas.payment_receipt import PaymentReceiptCreate, PaymentReceiptUpdate
+from app.schemas.payment_receipt import PaymentReceiptCreate, PaymentReceiptUpdate, PaymentReceiptResponse
 from app.config import settings
+from app.core.security import generate_download_token
+
+logger = logging.getLogger(__name__)
+
+# Lifetime of secure download tokens
+_TOKEN_TTL = timedelta(hours=24)
+
+# 18% GST, as the ratio base / (base + tax) = 100 / 118
+_GST_NUM = 100
+_GST_DEN = 118
+
+
+# Listings select only the columns the API serializes; loading full entities
+# pulls in columns like pdf_file_path and per-row identity-map bookkeeping
+_LISTING_COLUMNS = tuple(
+    getattr(PaymentReceipt, name) for name in PaymentReceiptResponse.model_fields
+)
+
+
+def _split_gst_paise(total_paise: int) -> Tuple[int, int]:
+    """Split a GST-inclusive amount in paise into (paise before tax, tax paise).
+    
+    The base is rounded half-up to the paisa and the tax is the remainder,
+    so the two always add back up to the total.
+    """
+    before_paise = (2 * total_paise * _GST_NUM + _GST_DEN) // (2 * _GST_DEN)
+    return before_paise, total_paise - before_paise
+
+
+def _split_gst_inclusive(total: Decimal) -> Tuple[Decimal, Decimal]:
+    """Split a GST-inclusive amount into (amount before tax, tax)."""
+    before_paise, tax_paise = _split_gst_paise(int(total * 100))
+    return Decimal(before_paise).scaleb(-2), Decimal(tax_paise).scaleb(-2)
+
+
+@lru_cache(maxsize=1)
+def _get_company_details() -> Tuple[str, str, str]:
+    """Issuing company address, GSTIN and PAN (fixed for the process lifetime)."""
+    return settings.company_address, settings.company_gstin, settings.company_pan
+
+
+
+def send_receipt_email_task(receipt_id: int, to_email: str = None, user_id: int = None) -> None:
+    """Generate (if needed) and email a receipt outside the request cycle.
+    
+    Runs as a FastAPI background task with its own database session.
+    """
+    db = SessionLocal()
+    try:
+        PaymentReceiptService(db).send_receipt_email(
+            receipt_id=receipt_id,
+            to_email=to_email,
+            user_id=user_id
+        )
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to send receipt %s", receipt_id)
+    finally:
+        db.close()
 
 
 class PaymentReceiptService:
     """Service class for payment receipt operations."""
     
+    # Directories already created by this process
+    _created_dirs: Set[str] = set()
+    
     def __init__(self, db: Session):
         self.db = db
-        self.pdf_service = PDFService()
-        self.audit_service = AuditService(db)
-        self.notification_service = NotificationService(db)
-        self.email_service = EmailService(db)
+    
+    # Collaborating services are built on first use; most requests (listings,
+    # lookups) never touch them
+    @cached_property
+    def pdf_service(self) -> PDFService:
+        return PDFService(self.db)
+    
+    @cached_property
+    def audit_service(self) -> AuditService:
+        return AuditService(self.db)
+    
+    @cached_property
+    def notification_service(self) -> NotificationService:
+        return NotificationService(self.db)
+    
+    @cached_property
+    def email_service(self) -> EmailService:
+        return EmailService(self.db)
     
     def create_receipt_from_payment(
         self,
@@ -41,81 +123,62 @@ class PaymentReceiptService:
     ) -> PaymentReceipt:
         """Create a payment receipt from a successful payment."""
         
-        payment = self.db.query(Payment).filter(Payment.id == payment_id).first()
+        # Load the payment with its subscription, plan, user and company
+        # profile in a single round-trip
+        payment = self.db.query(Payment).options(
+            joinedload(Payment.subscription)
+            .joinedload(Subscription.user)
+            .joinedload(User.company_profile),
+            joinedload(Payment.subscription).joinedload(Subscription.plan)
+        ).filter(Payment.id == payment_id).first()
         if not payment:
             raise ValueError("Payment not found")
         
         if payment.status != "success":
             raise ValueError("Can only create receipts for successful payments")
         
-        # Check if receipt already exists
-        existing_receipt = self.db.query(PaymentReceipt).filter(
-            PaymentReceipt.payment_id == payment_id
-        ).first()
-        if existing_receipt:
-            return existing_receipt
-        
-        # Get user and subscription details
-        subscription = payment.subscription
-        user = subscription.user
-        company_profile = self.db.query(CompanyProfile).filter(
-            CompanyProfile.user_id == user.id
-        ).first()
-        
-        # Generate receipt number
-        receipt_number = self._generate_receipt_number()
-        
-        # Calculate tax (18% GST on subscription)
-        tax_rate = Decimal('0.18')  # 18% GST
-        amount_before_tax = payment.amount / (1 + tax_rate)
-        tax_amount = payment.amount - amount_before_tax
-        
-        # Create receipt
-        receipt = PaymentReceipt(
-            receipt_number=receipt_number,
-            receipt_type=ReceiptType.SUBSCRIPTION_PAYMENT,
-            status=ReceiptStatus.DRAFT,
-            user_id=user.id,
-            payment_id=payment.id,
-            subscription_id=subscription.id,
-            receipt_date=datetime.utcnow(),
-            payment_date=payment.payment_date or payment.created_at,
-            amount=amount_before_tax,
-            tax_amount=tax_amount,
-            total_amount=payment.amount,
-            currency=payment.currency,
-            currency_symbol="₹",
-            payment_method=payment.method.value if payment.method else "Online",
-            transaction_id=payment.razorpay_payment_id,
-            razorpay_payment_id=payment.razorpay_payment_id,
-            title=f"{subscription.plan.name} Subscription Payment",
-            description=f"Payment for {subscription.plan.name} subscription plan",
-            customer_name=user.full_name,
-            customer_email=user.email,
-            customer_phone=company_profile.phone if company_profile else None,
-            customer_address=self._format_address(company_profile) if company_profile else None,
-            customer_gstin=company_profile.gstin if company_profile else None,
-            company_name=settings.app_name,
-            company_address=self._get_company_address(),
-            company_gstin=self._get_company_gstin(),
-            company_pan=self._get_company_pan(),
-            admin_notes=admin_notes,
-            created_by=created_by_user_id
-        )
-        
-        self.db.add(receipt)
+        now = datetime.utcnow()
+        
+        # Reserve the number and insert inside a savepoint, so a conflict
+        # releases the number without discarding the caller's pending work
+        savepoint = self.db.begin_nested()
+        try:
+            receipt_number = self._generate_receipt_number(now)
+            
+            # Create the receipt unless the payment already has one; the unique
+            # payment_id index makes this safe against concurrent requests
+            stmt = pg_insert(PaymentReceipt).values(**self._subscription_receipt_values(
+                payment, receipt_number, now, admin_notes, created_by_user_id
+            )).on_conflict_do_nothing(
+                index_elements=[PaymentReceipt.payment_id]
+            ).returning(PaymentReceipt)
+            receipt = self.db.execute(stmt).scalar_one_or_none()
+        except Exception:
+            savepoint.rollback()
+            raise
+        
+        if receipt is None:
+            # Release the reserved receipt number and return the existing receipt
+            savepoint.rollback()
+            existing = self.db.query(PaymentReceipt).filter(
+                PaymentReceipt.payment_id == payment_id
+            ).one()
+            self.db.commit()
+            return existing
+        
+        savepoint.commit()
+        receipt_id, user_id = receipt.id, receipt.user_id
         self.db.commit()
-        self.db.refresh(receipt)
         
         # Log audit event
-        self.audit_service.log_action(
-            action="RECEIPT_CREATED",
-            user_id=created_by_user_id or user.id,
-            description=f"Created payment receipt {receipt.receipt_number}",
+        self.audit_service.log_action_async(
+            action=AuditAction.RECEIPT_CREATED,
+            user_id=created_by_user_id or user_id,
+            description=f"Created payment receipt {receipt_number}",
             resource_type="receipt",
-            resource_id=receipt.id,
-            metadata={
-                "receipt_number": receipt.receipt_number,
+            resource_id=receipt_id,
+            extra_data={
+                "receipt_number": receipt_number,
                 "payment_id": payment.id,
                 "amount": str(payment.amount)
             }
@@ -123,6 +186,63 @@ class PaymentReceiptService:
         
         return receipt
     
+    def create_receipts_bulk(
+        self,
+        payment_ids: List[int],
+        created_by_user_id: int = None
+    ) -> int:
+        """Create receipts for the successful payments that do not have one yet.
+        
+        Loads the payments in one query, reserves the receipt numbers in one
+        statement and inserts all receipts with a single multi-row INSERT.
+        Payments that get a receipt concurrently are skipped. Returns the
+        number of receipts created.
+        """
+        
+        payments = self.db.query(Payment).options(
+            joinedload(Payment.subscription)
+            .joinedload(Subscription.user)
+            .joinedload(User.company_profile),
+            joinedload(Payment.subscription).joinedload(Subscription.plan)
+        ).filter(
+            Payment.id.in_(payment_ids),
+            Payment.status == PaymentStatus.SUCCESS,
+            ~Payment.payment_receipts.any()
+        ).order_by(Payment.id).all()
+        if not payments:
+            return 0
+        
+        now = datetime.utcnow()
+        receipt_numbers = self._reserve_receipt_numbers(len(payments), now)
+        
+        rows = [
+            self._subscription_receipt_values(
+                payment, receipt_number, now, None, created_by_user_id
+            )
+            for payment, receipt_number in zip(payments, receipt_numbers)
+        ]
+        # Skip payments that were given a receipt since they were loaded
+        stmt = pg_insert(PaymentReceipt).values(rows).on_conflict_do_nothing(
+            index_elements=[PaymentReceipt.payment_id]
+        ).returning(PaymentReceipt.payment_id, PaymentReceipt.receipt_number)
+        created = self.db.execute(stmt).all()
+        self.db.commit()
+        
+        if created:
+            # One audit entry for the whole batch
+            self.audit_service.log_action_async(
+                action=AuditAction.RECEIPTS_BULK_CREATED,
+                user_id=created_by_user_id,
+                description=f"Created {len(created)} payment receipts",
+                resource_type="receipt",
+                extra_data={
+                    "payment_ids": [row.payment_id for row in created],
+                    "receipt_numbers": [row.receipt_number for row in created]
+                }
+            )
+        
+        return len(created)
+    
     def create_receipt_from_invoice_payment(
         self,
         invoice_id: int,
@@ -131,27 +251,28 @@ class PaymentReceiptService:
     ) -> PaymentReceipt:
         """Create a payment receipt from invoice payment."""
         
-        invoice = self.db.query(Invoice).filter(Invoice.id == invoice_id).first()
+        invoice = self.db.query(Invoice).options(
+            joinedload(Invoice.user).joinedload(User.company_profile)
+        ).filter(Invoice.id == invoice_id).first()
         if not invoice:
             raise ValueError("Invoice not found")
         
         user = invoice.user
-        company_profile = self.db.query(CompanyProfile).filter(
-            CompanyProfile.user_id == user.id
-        ).first()
+        company_profile = user.company_profile
+        now = datetime.utcnow()
         
         # Generate receipt number
-        receipt_number = self._generate_receipt_number()
+        receipt_number = self._generate_receipt_number(now)
         
         # Create receipt
-        receipt = PaymentReceipt(
+        receipt = self._insert_receipt(
             receipt_number=receipt_number,
             receipt_type=ReceiptType.INVOICE_PAYMENT,
             status=ReceiptStatus.DRAFT,
             user_id=user.id,
             invoice_id=invoice.id,
-            receipt_date=datetime.utcnow(),
-            payment_date=payment_details.get('payment_date', datetime.utcnow()),
+            receipt_date=now,
+            payment_date=payment_details.get('payment_date', now),
             amount=invoice.subtotal,
             tax_amount=invoice.tax_amount,
             total_amount=invoice.grand_total,
@@ -173,19 +294,18 @@ class PaymentReceiptService:
             created_by=created_by_user_id
         )
         
-        self.db.add(receipt)
+        receipt_id = receipt.id
         self.db.commit()
-        self.db.refresh(receipt)
         
         # Log audit event
-        self.audit_service.log_action(
-            action="RECEIPT_CREATED",
+        self.audit_service.log_action_async(
+            action=AuditAction.RECEIPT_CREATED,
             user_id=created_by_user_id or user.id,
-            description=f"Created payment receipt {receipt.receipt_number} for invoice {invoice.invoice_number}",
+            description=f"Created payment receipt {receipt_number} for invoice {invoice.invoice_number}",
             resource_type="receipt",
-            resource_id=receipt.id,
-            metadata={
-                "receipt_number": receipt.receipt_number,
+            resource_id=receipt_id,
+            extra_data={
+                "receipt_number": receipt_number,
                 "invoice_id": invoice.id,
                 "invoice_number": invoice.invoice_number,
                 "amount": str(invoice.grand_total)
@@ -201,36 +321,46 @@ class PaymentReceiptService:
         if not receipt:
             raise ValueError("Receipt not found")
         
-        # Generate PDF using template
-        pdf_content = self.pdf_service.generate_receipt_pdf(receipt)
+        now = datetime.utcnow()
         
-        # Save PDF file
-        pdf_filename = f"receipt_{receipt.receipt_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        pdf_filename = f"receipt_{receipt.receipt_number}_{now.strftime('%Y%m%d_%H%M%S')}.pdf"
         pdf_path = os.path.join(settings.upload_dir, "receipts", pdf_filename)
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-        
-        # Write PDF content
-        with open(pdf_path, 'wb') as f:
-            f.write(pdf_content)
+        # Ensure directory exists (once per process)
+        pdf_dir = os.path.dirname(pdf_path)
+        if pdf_dir not in self._created_dirs:
+            os.makedirs(pdf_dir, exist_ok=True)
+            self._created_dirs.add(pdf_dir)
+        
+        # Render straight into a temp file, then swap it into place so
+        # readers never observe a partially written PDF
+        tmp_path = f"{pdf_path}.tmp"
+        try:
+            self.pdf_service.generate_receipt_pdf(receipt, target=tmp_path)
+            os.replace(tmp_path, pdf_path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
         
         # Update receipt
         receipt.pdf_generated = True
         receipt.pdf_file_path = pdf_path
-        receipt.pdf_generated_at = datetime.utcnow()
+        receipt.pdf_generated_at = now
         receipt.status = ReceiptStatus.GENERATED
         
         self.db.commit()
         
         # Log audit event
-        self.audit_service.log_action(
-            action="RECEIPT_PDF_GENERATED",
+        self.audit_service.log_action_async(
+            action=AuditAction.RECEIPT_PDF_GENERATED,
             user_id=user_id or receipt.user_id,
             description=f"Generated PDF for receipt {receipt.receipt_number}",
             resource_type="receipt",
             resource_id=receipt.id,
-            metadata={
+            extra_data={
                 "receipt_number": receipt.receipt_number,
                 "pdf_path": pdf_path
             }
@@ -273,17 +403,24 @@ class PaymentReceiptService:
         )
         
         # Update receipt
-        receipt.mark_as_sent(email_to)
+        self.db.execute(
+            update(PaymentReceipt).where(PaymentReceipt.id == receipt.id).values(
+                status=ReceiptStatus.SENT,
+                email_sent=True,
+                email_sent_at=datetime.utcnow(),
+                email_sent_to=email_to
+            )
+        )
         self.db.commit()
         
         # Log audit event
-        self.audit_service.log_action(
-            action="RECEIPT_SENT",
+        self.audit_service.log_action_async(
+            action=AuditAction.RECEIPT_SENT,
             user_id=user_id or receipt.user_id,
             description=f"Sent receipt {receipt.receipt_number} to {email_to}",
             resource_type="receipt",
             resource_id=receipt.id,
-            metadata={
+            extra_data={
                 "receipt_number": receipt.receipt_number,
                 "email_to": email_to,
                 "email_log_id": email_log.id
@@ -314,13 +451,13 @@ class PaymentReceiptService:
         self,
         user_id: int,
         limit: int = 50,
-        offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
         receipt_type: ReceiptType = None,
         status: ReceiptStatus = None
-    ) -> List[PaymentReceipt]:
-        """Get receipts for a user."""
+    ) -> Tuple[List[Row], Optional[Tuple[datetime, int]]]:
+        """Get a page of receipt rows for a user, newest first."""
         
-        query = self.db.query(PaymentReceipt).filter(PaymentReceipt.user_id == user_id)
+        query = self.db.query(*_LISTING_COLUMNS).filter(PaymentReceipt.user_id == user_id)
         
         if receipt_type:
             query = query.filter(PaymentReceipt.receipt_type == receipt_type)
@@ -328,38 +465,96 @@ class PaymentReceiptService:
         if status:
             query = query.filter(PaymentReceipt.status == status)
         
-        return query.order_by(PaymentReceipt.created_at.desc()).offset(offset).limit(limit).all()
+        return self._paginate(query, limit, cursor)
     
     def get_all_receipts_for_admin(
         self,
         limit: int = 50,
-        offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        receipt_type: ReceiptType = None,
+        status: ReceiptStatus = None,
+        user_id: int = None,
+        date_from: datetime = None,
+        date_to: datetime = None
+    ) -> Tuple[List[Row], Optional[Tuple[datetime, int]]]:
+        """Get a page of all receipt rows for admin management, newest first."""
+        
+        query = self.db.query(*_LISTING_COLUMNS).filter(*self._admin_filters(
+            receipt_type, status, user_id, date_from, date_to
+        ))
+        
+        return self._paginate(query, limit, cursor)
+    
+    def iter_all_receipts_for_admin(
+        self,
+        receipt_type: ReceiptType = None,
+        status: ReceiptStatus = None,
+        user_id: int = None,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        batch_size: int = 1000
+    ) -> Iterator[Row]:
+        """Stream every matching receipt row, newest first, for exports.
+        
+        Rows are fetched through a server-side cursor in batches of
+        `batch_size`, so memory stays flat however many receipts match.
+        """
+        
+        stmt = select(*_LISTING_COLUMNS).where(*self._admin_filters(
+            receipt_type, status, user_id, date_from, date_to
+        )).order_by(
+            PaymentReceipt.created_at.desc(),
+            PaymentReceipt.id.desc()
+        ).execution_options(yield_per=batch_size)
+        
+        yield from self.db.execute(stmt)
+    
+    def _admin_filters(
+        self,
         receipt_type: ReceiptType = None,
         status: ReceiptStatus = None,
         user_id: int = None,
         date_from: datetime = None,
         date_to: datetime = None
-    ) -> List[PaymentReceipt]:
-        """Get all receipts for admin management."""
+    ) -> List[Any]:
+        """Build the WHERE conditions for the admin receipt views."""
         
-        query = self.db.query(PaymentReceipt)
+        filters = []
         
         if receipt_type:
-            query = query.filter(PaymentReceipt.receipt_type == receipt_type)
+            filters.append(PaymentReceipt.receipt_type == receipt_type)
         
         if status:
-            query = query.filter(PaymentReceipt.status == status)
+            filters.append(PaymentReceipt.status == status)
         
         if user_id:
-            query = query.filter(PaymentReceipt.user_id == user_id)
+            filters.append(PaymentReceipt.user_id == user_id)
         
         if date_from:
-            query = query.filter(PaymentReceipt.created_at >= date_from)
+            filters.append(PaymentReceipt.created_at >= date_from)
         
         if date_to:
-            query = query.filter(PaymentReceipt.created_at <= date_to)
+            filters.append(PaymentReceipt.created_at <= date_to)
+        
+        return filters
+    
+    def _paginate(self, query, limit: int, cursor: Optional[Tuple[datetime, int]]):
+        """Apply keyset pagination on (created_at, id) and return (rows, next_cursor)."""
+        
+        if cursor:
+            query = query.filter(tuple_(PaymentReceipt.created_at, PaymentReceipt.id) < cursor)
+        
+        receipts = query.order_by(
+            PaymentReceipt.created_at.desc(),
+            PaymentReceipt.id.desc()
+        ).limit(limit).all()
         
-        return query.order_by(PaymentReceipt.created_at.desc()).offset(offset).limit(limit).all()
+        next_cursor = None
+        if len(receipts) == limit:
+            last = receipts[-1]
+            next_cursor = (last.created_at, last.id)
+        
+        return receipts, next_cursor
     
     def admin_review_receipt(
         self,
@@ -370,25 +565,40 @@ class PaymentReceiptService:
     ) -> PaymentReceipt:
         """Admin review of receipt."""
         
-        receipt = self.get_receipt_by_id(receipt_id)
+        values = {
+            "admin_reviewed": True,
+            "admin_reviewed_by": admin_user_id,
+            "admin_reviewed_at": datetime.utcnow(),
+            "updated_by": admin_user_id
+        }
+        if notes is not None:
+            values["admin_notes"] = notes
+        if approved:
+            # Approving promotes drafts; other statuses are left as-is
+            values["status"] = case(
+                (PaymentReceipt.status == ReceiptStatus.DRAFT, ReceiptStatus.GENERATED),
+                else_=PaymentReceipt.status
+            )
+        
+        stmt = update(PaymentReceipt).where(
+            PaymentReceipt.id == receipt_id
+        ).values(**values).returning(PaymentReceipt)
+        
+        receipt = self.db.execute(stmt).scalar_one_or_none()
         if not receipt:
             raise ValueError("Receipt not found")
         
-        receipt.admin_review(admin_user_id, notes)
-        
-        if approved and receipt.status == ReceiptStatus.DRAFT:
-            receipt.status = ReceiptStatus.GENERATED
-        
+        receipt_number = receipt.receipt_number
         self.db.commit()
         
         # Log admin action
-        self.audit_service.log_admin_action(
+        self.audit_service.log_admin_action_async(
             admin_id=admin_user_id,
-            action_type="RECEIPT_MANAGEMENT",
+            action_type=AdminActionType.RECEIPT_MANAGEMENT,
             action_name="Receipt Review",
-            description=f"Reviewed receipt {receipt.receipt_number}",
+            description=f"Reviewed receipt {receipt_number}",
             target_resource_type="receipt",
-            target_resource_id=receipt.id,
+            target_resource_id=receipt_id,
             operation_data={
                 "approved": approved,
                 "notes": notes
@@ -406,32 +616,43 @@ class PaymentReceiptService:
     ) -> Optional[PaymentReceipt]:
         """Update receipt details."""
         
-        receipt = self.get_receipt_by_id(receipt_id, user_id)
-        if not receipt:
-            return None
+        update_data = receipt_data.dict(exclude_unset=True)
+        values = {
+            field: value for field, value in update_data.items()
+            if field in PaymentReceipt.__table__.columns
+        }
+        values["updated_by"] = admin_user_id or user_id
+        
+        # Only allow updates to draft receipts; the status guard and the
+        # write happen in the same statement
+        conditions = [
+            PaymentReceipt.id == receipt_id,
+            PaymentReceipt.status == ReceiptStatus.DRAFT
+        ]
+        if user_id:
+            conditions.append(PaymentReceipt.user_id == user_id)
         
-        # Only allow updates to draft receipts
-        if receipt.status != ReceiptStatus.DRAFT:
-            raise ValueError("Can only update draft receipts")
+        stmt = update(PaymentReceipt).where(*conditions).values(**values).returning(PaymentReceipt)
+        receipt = self.db.execute(stmt).scalar_one_or_none()
         
-        # Update fields
-        update_data = receipt_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(receipt, field):
-                setattr(receipt, field, value)
+        if not receipt:
+            if not self.get_receipt_by_id(receipt_id, user_id):
+                return None
+            raise ValueError("Can only update draft receipts")
         
-        receipt.updated_by = admin_user_id or user_id
+        receipt_number = receipt.receipt_number
+        receipt_owner_id = receipt.user_id
         self.db.commit()
         
         # Log audit event
-        self.audit_service.log_action(
-            action="RECEIPT_UPDATED",
-            user_id=admin_user_id or user_id or receipt.user_id,
-            description=f"Updated receipt {receipt.receipt_number}",
+        self.audit_service.log_action_async(
+            action=AuditAction.RECEIPT_UPDATED,
+            user_id=admin_user_id or user_id or receipt_owner_id,
+            description=f"Updated receipt {receipt_number}",
             resource_type="receipt",
-            resource_id=receipt.id,
-            metadata={
-                "receipt_number": receipt.receipt_number,
+            resource_id=receipt_id,
+            extra_data={
+                "receipt_number": receipt_number,
                 "changes": update_data
             }
         )
@@ -450,13 +671,16 @@ class PaymentReceiptService:
             raise ValueError("Can only delete draft receipts")
         
         # Delete PDF file if exists
-        if receipt.pdf_file_path and os.path.exists(receipt.pdf_file_path):
-            os.remove(receipt.pdf_file_path)
+        if receipt.pdf_file_path:
+            try:
+                os.unlink(receipt.pdf_file_path)
+            except FileNotFoundError:
+                pass
         
         # Log before deletion
-        self.audit_service.log_admin_action(
+        self.audit_service.log_admin_action_async(
             admin_id=admin_user_id,
-            action_type="RECEIPT_MANAGEMENT",
+            action_type=AdminActionType.RECEIPT_MANAGEMENT,
             action_name="Receipt Deletion",
             description=f"Deleted receipt {receipt.receipt_number}",
             target_resource_type="receipt",
@@ -468,26 +692,92 @@ class PaymentReceiptService:
         
         return True
     
-    def _generate_receipt_number(self) -> str:
+    def _subscription_receipt_values(
+        self,
+        payment: Payment,
+        receipt_number: str,
+        now: datetime,
+        admin_notes: str = None,
+        created_by_user_id: int = None
+    ) -> Dict[str, Any]:
+        """Build the column values for a subscription payment receipt.
+        
+        Expects the payment's subscription, plan, user and company profile
+        to be loaded already.
+        """
+        
+        subscription = payment.subscription
+        plan = subscription.plan
+        user = subscription.user
+        company_profile = user.company_profile
+        
+        # Calculate tax (18% GST on subscription)
+        amount_before_tax, tax_amount = _split_gst_inclusive(payment.amount)
+        
+        return dict(
+            receipt_number=receipt_number,
+            receipt_type=ReceiptType.SUBSCRIPTION_PAYMENT,
+            status=ReceiptStatus.DRAFT,
+            user_id=user.id,
+            payment_id=payment.id,
+            subscription_id=subscription.id,
+            receipt_date=now,
+            payment_date=payment.payment_date or payment.created_at,
+            amount=amount_before_tax,
+            tax_amount=tax_amount,
+            total_amount=payment.amount,
+            currency=payment.currency,
+            currency_symbol="₹",
+            payment_method=payment.method.value if payment.method else "Online",
+            transaction_id=payment.razorpay_payment_id,
+            razorpay_payment_id=payment.razorpay_payment_id,
+            title=f"{plan.name} Subscription Payment",
+            description=f"Payment for {plan.name} subscription plan",
+            customer_name=user.full_name,
+            customer_email=user.email,
+            customer_phone=company_profile.phone if company_profile else None,
+            customer_address=self._format_address(company_profile) if company_profile else None,
+            customer_gstin=company_profile.gstin if company_profile else None,
+            company_name=settings.app_name,
+            company_address=self._get_company_address(),
+            company_gstin=self._get_company_gstin(),
+            company_pan=self._get_company_pan(),
+            admin_notes=admin_notes,
+            created_by=created_by_user_id
+        )
+    
+    def _insert_receipt(self, **values) -> PaymentReceipt:
+        """Insert a receipt with INSERT ... RETURNING.
+        
+        The ORM instance comes back from the INSERT itself, skipping the
+        unit-of-work flush and the follow-up refresh SELECT.
+        """
+        stmt = insert(PaymentReceipt).values(**values).returning(PaymentReceipt)
+        return self.db.execute(stmt).scalar_one()
+    
+    def _generate_receipt_number(self, now: datetime = None) -> str:
         """Generate unique receipt number."""
+        return self._reserve_receipt_numbers(1, now)[0]
+    
+    def _reserve_receipt_numbers(self, count: int, now: datetime = None) -> List[str]:
+        """Atomically reserve `count` consecutive receipt numbers for this month."""
         
         # Get current year and month
-        now = datetime.now()
-        year_month = now.strftime("%Y%m")
+        year_month = (now or datetime.utcnow()).strftime("%Y%m")
         
-        # Get the last receipt number for this month
-        last_receipt = self.db.query(PaymentReceipt).filter(
-            PaymentReceipt.receipt_number.like(f"{year_month}%")
-        ).order_by(PaymentReceipt.receipt_number.desc()).first()
+        # Claim the whole range with a single upsert
+        stmt = pg_insert(ReceiptSequence).values(year_month=year_month, last_seq=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReceiptSequence.year_month],
+            set_={"last_seq": ReceiptSequence.last_seq + count}
+        ).returning(ReceiptSequence.last_seq)
         
-        if last_receipt:
-            # Extract sequence number and increment
-            last_sequence = int(last_receipt.receipt_number[-4:])
-            sequence = last_sequence + 1
-        else:
-            sequence = 1
+        last_seq = self.db.execute(stmt).scalar_one()
         
-        return f"{year_month}{sequence:04d}"
+        return [
+            f"{year_month}{sequence:04d}"
+            for sequence in range(last_seq - count + 1, last_seq + 1)
+        ]
     
     def _generate_secure_download_token(
         self, 
@@ -497,22 +787,21 @@ class PaymentReceiptService:
         """Generate secure download token for receipt PDF."""
         
         # Generate token
-        token_plain = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(token_plain.encode()).hexdigest()
+        token_plain, token_hash = generate_download_token()
         
         # Create token record
         download_token = SecureDownloadToken(
             user_id=user_id,
             receipt_id=receipt_id,
             token_hash=token_hash,
-            token_plain=token_plain,
-            expires_at=datetime.utcnow() + timedelta(hours=24),  # 24 hour expiry
+            expires_at=datetime.utcnow() + _TOKEN_TTL,
             max_downloads=5
         )
         
         self.db.add(download_token)
         self.db.commit()
         
+        download_token.token_plain = token_plain
         return download_token
     
     def _format_address(self, company_profile: CompanyProfile) -> str:
@@ -520,45 +809,31 @@ class PaymentReceiptService:
         if not company_profile:
             return None
         
-        address_parts = []
-        if company_profile.address:
-            address_parts.append(company_profile.address)
-        if company_profile.city:
-            address_parts.append(company_profile.city)
-        if company_profile.state:
-            address_parts.append(company_profile.state)
-        if company_profile.postal_code:
-            address_parts.append(company_profile.postal_code)
-        
-        return ", ".join(address_parts) if address_parts else None
+        return ", ".join(filter(None, (
+            company_profile.address,
+            company_profile.city,
+            company_profile.state,
+            company_profile.postal_code
+        ))) or None
     
     def _format_invoice_client_address(self, invoice: Invoice) -> str:
         """Format invoice client address."""
-        address_parts = []
-        if invoice.client_address_line1:
-            address_parts.append(invoice.client_address_line1)
-        if invoice.client_address_line2:
-            address_parts.append(invoice.client_address_line2)
-        if invoice.client_city:
-            address_parts.append(invoice.client_city)
-        if invoice.client_state:
-            address_parts.append(invoice.client_state)
-        if invoice.client_postal_code:
-            address_parts.append(invoice.client_postal_code)
-        
-        return ", ".join(address_parts) if address_parts else None
+        return ", ".join(filter(None, (
+            invoice.client_address_line1,
+            invoice.client_address_line2,
+            invoice.client_city,
+            invoice.client_state,
+            invoice.client_postal_code
+        ))) or None
     
     def _get_company_address(self) -> str:
         """Get company address from settings."""
-        # This should be configurable in settings
-        return "123 Business Street, Business City, State 12345, India"
+        return _get_company_details()[0]
     
     def _get_company_gstin(self) -> str:
         """Get company GSTIN from settings."""
-        # This should be configurable in settings
-        return "22AAAAA0000A1Z5"
+        return _get_company_details()[1]
     
     def _get_company_pan(self) -> str:
         """Get company PAN from settings."""
-        # This should be configurable in settings
-        return "AAAAA0000A"
\ No newline at end of file
+        return _get_company_details()[2]
@@ -1,216 +1,305 @@
 """PDF generation service for invoices and receipts."""
 
+import logging
+import multiprocessing
 import os
-from typing import Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Set, Tuple
 from decimal import Decimal
 from datetime import datetime
 import weasyprint
-from jinja2 import Environment, FileSystemLoader
-from sqlalchemy.orm import Session
+from weasyprint.text.fonts import FontConfiguration
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.models.invoice import Invoice
 from app.models.payment_receipt import PaymentReceipt
 from app.models.company_profile import CompanyProfile
-from app.models.file_asset import FileAsset
+from app.models.user import User
 from app.config import settings
+from app.database import SessionLocal
 
+if TYPE_CHECKING:
+    from app.services.template_service import ResolvedTemplate
 
-class PDFService:
-    """Service class for PDF generation."""
+logger = logging.getLogger(__name__)
+
+
+def _create_bytecode_cache() -> FileSystemBytecodeCache:
+    """Create the on-disk cache for compiled template code."""
+    directory = settings.jinja_bytecode_cache_dir
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory=directory, pattern="__jinja2_%s.cache")
+
+
+# Compiled template code shared across worker processes and restarts.
+# Entries are keyed by a checksum of the template source, so an edited
+# template never picks up stale code.
+_bytecode_cache = _create_bytecode_cache()
+
+# One Jinja environment per template directory, shared across PDFService
+# instances so compiled templates are reused between renders
+_template_envs: Dict[str, Environment] = {}
+
+# Parsed WeasyPrint stylesheets keyed by path, with the file mtime they
+# were parsed from so edited templates are picked up
+_stylesheets: Dict[str, Tuple[Optional[int], weasyprint.CSS]] = {}
+
+
+# Output directories already created by this process
+_created_dirs: Set[str] = set()
+
+# Decoded images (logos, stamps) keyed by URL, shared across renders
+_image_cache: Dict[str, Any] = {}
+_IMAGE_CACHE_MAX_ENTRIES = 256
+
+# Worker processes for bulk PDF layout, started on first use and kept for
+# the life of the app so each request skips forkserver and import startup
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+_pdf_executor_lock = threading.Lock()
+
+# Per-thread WeasyPrint font configuration; building one scans the system
+# fonts, but Pango font maps are not safe to share between threads
+_thread_local = threading.local()
+
+
+def _render_options() -> Dict[str, Any]:
+    """WeasyPrint write_pdf options that reuse fonts and decoded images."""
+    font_config = getattr(_thread_local, "font_config", None)
+    if font_config is None:
+        font_config = _thread_local.font_config = FontConfiguration()
     
-    def __init__(self, db: Session = None):
-        self.db = db
-        self.template_dir = os.path.join(os.path.dirname(__file__), "..", "templates", "pdf")
-        self.env = Environment(loader=FileSystemLoader(self.template_dir))
+    # Keep the image cache bounded as logos from many users pass through
+    if len(_image_cache) > _IMAGE_CACHE_MAX_ENTRIES:
+        _image_cache.clear()
     
-    def generate_invoice_pdf(self, invoice_id: int, user_id: int, template_id: int = None) -> Optional[str]:
-        """Generate PDF for an invoice using specified or default template."""
-        # Get invoice with items
-        invoice = self.db.query(Invoice).filter(
-            Invoice.id == invoice_id,
-            Invoice.user_id == user_id
-        ).first()
-        
-        if not invoice:
-            return None
-        
-        # Get template
-        from app.services.template_service import TemplateService
-        from app.models.template import TemplateCategory
-        
-        template_service = TemplateService(self.db)
-        
-        if template_id:
-            template = template_service.get_template_by_id(template_id)
-            if not template or template.category != TemplateCategory.INVOICE:
-                template = template_service.get_user_default_template(user_id, TemplateCategory.INVOICE)
-        else:
-            template = template_service.get_user_default_template(user_id, TemplateCategory.INVOICE)
-        
-        if not template:
-            template = template_service.get_default_template(TemplateCategory.INVOICE)
-        
-        if not template:
-            return None
-        
-        # Update invoice template reference
-        invoice.template_id = template.id
-        self.db.commit()
-        
-        # Get company profile
-        company_profile = self.db.query(CompanyProfile).filter(
-            CompanyProfile.user_id == user_id
-        ).first()
-        
-        # Get logo and stamp files
-        logo_url = None
-        stamp_url = None
-        
-        if company_profile:
-            if company_profile.logo_file_id:
-                logo_file = self.db.query(FileAsset).filter(
-                    FileAsset.id == company_profile.logo_file_id
-                ).first()
-                if logo_file:
-                    logo_url = logo_file.file_path
-            
-            if company_profile.stamp_file_id:
-                stamp_file = self.db.query(FileAsset).filter(
-                    FileAsset.id == company_profile.stamp_file_id
-                ).first()
-                if stamp_file:
-                    stamp_url = stamp_file.file_path
-        
-        # Prepare template context
-        context = {
-            'invoice': invoice,
-            'company': company_profile,
-            'logo_url': logo_url,
-            'stamp_url': stamp_url,
-            'items': invoice.items,
-            'generated_at': datetime.now(),
-            'format_currency': self._format_currency,
-            'format_date': self._format_date,
-            'number_to_words': self._number_to_words
-        }
-        
-        # Load template using Jinja2
-        from jinja2 import Environment, FileSystemLoader
-        import os
-        
-        template_dir = os.path.dirname(template.html_path)
-        env = Environment(loader=FileSystemLoader(template_dir))
-        jinja_template = env.get_template(template.html_file)
-        
-        # Render HTML content
-        html_content = jinja_template.render(context)
-        
-        # Load CSS content
-        css_content = ""
-        if os.path.exists(template.css_path):
-            with open(template.css_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-        
-        # Generate PDF
-        pdf_filename = f"invoice_{invoice.invoice_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = os.path.join(settings.upload_dir, "pdfs", pdf_filename)
-        
-        # Ensure PDF directory exists
-        os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
-        
-        try:
-            # Generate PDF with WeasyPrint
-            weasyprint.HTML(string=html_content, base_url=template_dir).write_pdf(
-                pdf_path,
-                stylesheets=[weasyprint.CSS(string=css_content)]
-            )
-            
-            # Update invoice with PDF path
-            invoice.pdf_generated = True
-            invoice.pdf_file_path = pdf_path
-            self.db.commit()
-            
-            return pdf_path
-            
-        except Exception as e:
-            print(f"PDF generation error: {e}")
-            return None
+    return {"font_config": font_config, "cache": _image_cache}
+
+
+def _get_template_env(template_dir: str) -> Environment:
+    """Get the shared Jinja environment for a template directory."""
+    env = _template_envs.get(template_dir)
+    if env is None:
+        env = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=_bytecode_cache,
+            auto_reload=settings.pdf_template_auto_reload
+        )
+        env.globals.update(_TEMPLATE_GLOBALS)
+        _template_envs[template_dir] = env
+    return env
+
+
+def _get_compiled_template(html_path: str) -> Template:
+    """Get the compiled Jinja template for a template file.
     
-    def _format_currency(self, amount: Decimal, symbol: str = "₹") -> str:
-        """Format currency amount."""
-        return f"{symbol} {amount:,.2f}"
+    The shared environment keeps compiled templates in its cache and, with
+    auto-reload on, recompiles when the file on disk changes, so in-place
+    template edits still take effect.
+    """
+    template_dir, html_file = os.path.split(html_path)
+    return _get_template_env(template_dir).get_template(html_file)
+
+
+def _get_stylesheet(css_path: str) -> weasyprint.CSS:
+    """Get the parsed stylesheet for a CSS file, reparsing only when it changes."""
+    try:
+        mtime = os.stat(css_path).st_mtime_ns
+    except OSError:
+        mtime = None
     
-    def _format_date(self, date_obj) -> str:
-        """Format date for display."""
-        if not date_obj:
-            return ""
-        return date_obj.strftime("%d/%m/%Y")
+    cached = _stylesheets.get(css_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
     
-    def _number_to_words(self, amount: Decimal) -> str:
-        """Convert number to words (simplified version)."""
-        # This is a simplified implementation
-        # In production, use a proper number-to-words library
-        
-        ones = ["", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine"]
-        teens = ["Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", 
-                "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
-        tens = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
-        
-        def convert_hundreds(num):
-            result = ""
-            if num >= 100:
-                result += ones[num // 100] + " Hundred "
-                num %= 100
-            if num >= 20:
-                result += tens[num // 10] + " "
-                num %= 10
-            elif num >= 10:
-                result += teens[num - 10] + " "
-                num = 0
-            if num > 0:
-                result += ones[num] + " "
-            return result
-        
-        if amount == 0:
-            return "Zero Rupees Only"
-        
-        # Split into rupees and paise
-        rupees = int(amount)
-        paise = int((amount - rupees) * 100)
-        
-        result = ""
-        
-        # Convert rupees
-        if rupees >= 10000000:  # Crores
-            crores = rupees // 10000000
-            result += convert_hundreds(crores) + "Crore "
-            rupees %= 10000000
-        
-        if rupees >= 100000:  # Lakhs
-            lakhs = rupees // 100000
-            result += convert_hundreds(lakhs) + "Lakh "
-            rupees %= 100000
-        
-        if rupees >= 1000:  # Thousands
-            thousands = rupees // 1000
-            result += convert_hundreds(thousands) + "Thousand "
-            rupees %= 1000
-        
-        if rupees > 0:
-            result += convert_hundreds(rupees)
-        
-        result += "Rupees"
-        
-        if paise > 0:
-            result += " and " + convert_hundreds(paise) + "Paise"
-        
-        result += " Only"
-        
-        return result.strip()
+    css_content = ""
+    if mtime is not None:
+        with open(css_path, 'r', encoding='utf-8') as f:
+            css_content = f.read()
     
-    def _get_pdf_css(self) -> str:
-        """Get CSS styles for PDF generation."""
-        return """
+    stylesheet = weasyprint.CSS(string=css_content)
+    _stylesheets[css_path] = (mtime, stylesheet)
+    return stylesheet
+
+
+_ONES = ("", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine")
+_TEENS = ("Ten", "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen",
+          "Sixteen", "Seventeen", "Eighteen", "Nineteen")
+_TENS = ("", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety")
+
+
+def _hundreds_to_words(num: int) -> str:
+    """Spell out 0-999 ("" for 0)."""
+    parts = []
+    hundreds, rest = divmod(num, 100)
+    if hundreds:
+        parts += (_ONES[hundreds], "Hundred")
+    if rest >= 20:
+        tens, ones = divmod(rest, 10)
+        parts.append(_TENS[tens])
+        if ones:
+            parts.append(_ONES[ones])
+    elif rest >= 10:
+        parts.append(_TEENS[rest - 10])
+    elif rest:
+        parts.append(_ONES[rest])
+    return " ".join(parts)
+
+
+# Words for every number below 1000, so spelling a group is a tuple index
+_HUNDREDS_WORDS = tuple(_hundreds_to_words(i) for i in range(1000))
+
+
+def _indian_words(num: int) -> List[str]:
+    """Spell out a whole number in crores, lakhs and thousands."""
+    crores, num = divmod(num, 10000000)
+    lakhs, num = divmod(num, 100000)
+    thousands, hundreds = divmod(num, 1000)
+    
+    parts = []
+    if crores:
+        parts += _indian_words(crores)
+        parts.append("Crore")
+    if lakhs:
+        parts += (_HUNDREDS_WORDS[lakhs], "Lakh")
+    if thousands:
+        parts += (_HUNDREDS_WORDS[thousands], "Thousand")
+    if hundreds:
+        parts.append(_HUNDREDS_WORDS[hundreds])
+    return parts
+
+
+@lru_cache(maxsize=4096)
+def _paise_to_words(total_paise: int) -> str:
+    """Spell out an amount given in paise, e.g. "Ten Rupees and Five Paise Only"."""
+    rupees, paise = divmod(total_paise, 100)
+    
+    parts = _indian_words(rupees)
+    parts.append("Rupees")
+    if paise:
+        parts += ("and", _HUNDREDS_WORDS[paise], "Paise")
+    parts.append("Only")
+    
+    return " ".join(parts)
+
+
+def _format_currency(amount: Decimal, symbol: str = "₹") -> str:
+    """Format currency amount."""
+    return f"{symbol} {amount:,.2f}"
+
+
+def _format_date(date_obj) -> str:
+    """Format date for display."""
+    if not date_obj:
+        return ""
+    return date_obj.strftime("%d/%m/%Y")
+
+
+def _number_to_words(amount: Decimal) -> str:
+    """Convert an amount to words in the Indian numbering system."""
+    if amount == 0:
+        return "Zero Rupees Only"
+    return _paise_to_words(int(amount * 100))
+
+
+# Helpers available to every PDF template; registered once per shared
+# environment instead of being passed in each render's context
+_TEMPLATE_GLOBALS = {
+    'format_currency': _format_currency,
+    'format_date': _format_date,
+    'number_to_words': _number_to_words
+}
+
+
+class InvoicePDFJob(NamedTuple):
+    """Rendered invoice HTML and where to write its PDF."""
+    invoice_id: int
+    html_content: str
+    base_url: str
+    css_path: str
+    pdf_path: str
+    template_id: int
+
+
+def _ensure_dir(directory: str) -> None:
+    """Create an output directory the first time this process writes to it."""
+    if directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
+
+def _write_invoice_pdf(job: InvoicePDFJob) -> None:
+    """Lay out the invoice HTML with WeasyPrint and write the PDF file."""
+    _ensure_dir(os.path.dirname(job.pdf_path))
+    weasyprint.HTML(string=job.html_content, base_url=job.base_url).write_pdf(
+        job.pdf_path,
+        stylesheets=[_get_stylesheet(job.css_path)],
+        **_render_options()
+    )
+
+
+def _mark_invoice_pdf_generated(db: Session, job: InvoicePDFJob) -> None:
+    """Record the generated PDF and the template it was rendered with."""
+    db.execute(
+        update(Invoice).where(Invoice.id == job.invoice_id).values(
+            pdf_generated=True,
+            pdf_file_path=job.pdf_path,
+            template_id=job.template_id
+        )
+    )
+    db.commit()
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Return the shared PDF worker pool, starting it on first use."""
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                _pdf_executor = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("forkserver")
+                )
+    return _pdf_executor
+
+
+def shutdown_pdf_executor(wait: bool = True) -> None:
+    """Stop the PDF worker pool; the next bulk render starts a new one."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        executor, _pdf_executor = _pdf_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def render_invoice_pdf_task(job: InvoicePDFJob) -> None:
+    """Render a prepared invoice PDF outside the request cycle.
+    
+    Runs as a FastAPI background task with its own database session.
+    """
+    try:
+        _write_invoice_pdf(job)
+    except Exception:
+        logger.exception("Failed to render PDF for invoice %s", job.invoice_id)
+        return
+    
+    db = SessionLocal()
+    try:
+        _mark_invoice_pdf_generated(db, job)
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to record PDF for invoice %s", job.invoice_id)
+    finally:
+        db.close()
+
+
+# Built-in fallback stylesheets
+_PDF_CSS = """
         @page {
             size: A4;
             margin: 1cm;
@@ -354,75 +443,8 @@ class PDFService:
             clear: both;
         }
         """
-    
-    def generate_receipt_pdf(self, receipt: PaymentReceipt, template_id: int = None) -> bytes:
-        """Generate PDF for a payment receipt using specified or default template."""
-        
-        # Get template
-        from app.services.template_service import TemplateService
-        from app.models.template import TemplateCategory
-        
-        template_service = TemplateService(self.db)
-        
-        if template_id:
-            template = template_service.get_template_by_id(template_id)
-            if not template or template.category != TemplateCategory.RECEIPT:
-                template = template_service.get_user_default_template(receipt.user_id, TemplateCategory.RECEIPT)
-        else:
-            template = template_service.get_user_default_template(receipt.user_id, TemplateCategory.RECEIPT)
-        
-        if not template:
-            template = template_service.get_default_template(TemplateCategory.RECEIPT)
-        
-        if not template:
-            raise ValueError("No receipt template available")
-        
-        # Update receipt template reference
-        receipt.template_id = template.id
-        if self.db:
-            self.db.commit()
-        
-        # Prepare template context
-        context = {
-            'receipt': receipt,
-            'generated_at': datetime.now(),
-            'format_currency': self._format_currency,
-            'format_date': self._format_date,
-            'number_to_words': self._number_to_words
-        }
-        
-        # Load template using Jinja2
-        from jinja2 import Environment, FileSystemLoader
-        import os
-        
-        template_dir = os.path.dirname(template.html_path)
-        env = Environment(loader=FileSystemLoader(template_dir))
-        jinja_template = env.get_template(template.html_file)
-        
-        # Render HTML content
-        html_content = jinja_template.render(context)
-        
-        # Load CSS content
-        css_content = ""
-        if os.path.exists(template.css_path):
-            with open(template.css_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-        
-        try:
-            # Generate PDF with WeasyPrint and return as bytes
-            pdf_bytes = weasyprint.HTML(string=html_content, base_url=template_dir).write_pdf(
-                stylesheets=[weasyprint.CSS(string=css_content)]
-            )
-            
-            return pdf_bytes
-            
-        except Exception as e:
-            print(f"Receipt PDF generation error: {e}")
-            raise e
-    
-    def _get_receipt_pdf_css(self) -> str:
-        """Get CSS styles for receipt PDF generation."""
-        return """
+
+_RECEIPT_PDF_CSS = """
         @page {
             size: A4;
             margin: 1cm;
@@ -618,4 +640,247 @@ class PDFService:
             display: table;
             clear: both;
         }
-        """
\ No newline at end of file
+        """
+
+
+class PDFService:
+    """Service class for PDF generation."""
+    
+    def __init__(self, db: Session = None):
+        self.db = db
+        self.template_dir = os.path.join(os.path.dirname(__file__), "..", "templates", "pdf")
+        self.env = _get_template_env(self.template_dir)
+    
+    def generate_invoice_pdf(self, invoice_id: int, user_id: int, template_id: int = None) -> Optional[str]:
+        """Generate PDF for an invoice using specified or default template."""
+        job = self.prepare_invoice_pdf(invoice_id, user_id, template_id)
+        if not job:
+            return None
+        
+        try:
+            _write_invoice_pdf(job)
+            _mark_invoice_pdf_generated(self.db, job)
+            return job.pdf_path
+            
+        except Exception:
+            self.db.rollback()
+            logger.exception("PDF generation failed for invoice %s", invoice_id)
+            return None
+    
+    def generate_invoice_pdfs_bulk(
+        self,
+        invoice_ids: List[int],
+        user_id: int,
+        template_id: int = None
+    ) -> Dict[int, Optional[str]]:
+        """Generate PDFs for several invoices, laying them out in parallel.
+        
+        The invoices are loaded in one query and their HTML is rendered
+        here, where the session lives; the WeasyPrint layout of each invoice
+        then runs in the shared worker pool.
+        Returns the PDF path per invoice id, or None where generation failed.
+        """
+        results: Dict[int, Optional[str]] = dict.fromkeys(invoice_ids)
+        invoices = self._load_invoices(invoice_ids, user_id)
+        if not invoices:
+            return results
+        
+        template = self._resolve_invoice_template(user_id, template_id)
+        if not template:
+            return results
+        
+        jobs = [self._build_invoice_job(invoice, template) for invoice in invoices]
+        
+        try:
+            executor = _get_pdf_executor()
+            futures = {executor.submit(_write_invoice_pdf, job): job for job in jobs}
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next request
+            shutdown_pdf_executor(wait=False)
+            logger.exception("PDF worker pool is broken")
+            return results
+        
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                future.result()
+            except BrokenProcessPool:
+                shutdown_pdf_executor(wait=False)
+                logger.exception("Failed to render PDF for invoice %s", job.invoice_id)
+                continue
+            except Exception:
+                logger.exception("Failed to render PDF for invoice %s", job.invoice_id)
+                continue
+            self.db.execute(
+                update(Invoice).where(Invoice.id == job.invoice_id).values(
+                    pdf_generated=True,
+                    pdf_file_path=job.pdf_path,
+                    template_id=job.template_id
+                )
+            )
+            results[job.invoice_id] = job.pdf_path
+        
+        self.db.commit()
+        return results
+    
+    def prepare_invoice_pdf(
+        self,
+        invoice_id: int,
+        user_id: int,
+        template_id: int = None
+    ) -> Optional[InvoicePDFJob]:
+        """Resolve the template and render the invoice HTML for PDF output.
+        
+        Everything that needs the database happens here; the returned job
+        can then be rendered to PDF without a session, in or out of the
+        request. The invoice is not modified; the template reference is
+        recorded with the PDF path once the PDF has been written.
+        """
+        invoices = self._load_invoices([invoice_id], user_id)
+        if not invoices:
+            return None
+        
+        template = self._resolve_invoice_template(user_id, template_id)
+        if not template:
+            return None
+        
+        return self._build_invoice_job(invoices[0], template)
+    
+    def _load_invoices(self, invoice_ids: List[int], user_id: int) -> List[Invoice]:
+        """Load the user's invoices with everything their templates render."""
+        # Get invoices with their items, company profile, logo and stamp
+        company_profile_load = joinedload(Invoice.user).joinedload(User.company_profile)
+        return self.db.query(Invoice).options(
+            selectinload(Invoice.items),
+            company_profile_load.joinedload(CompanyProfile.logo_file),
+            company_profile_load.joinedload(CompanyProfile.stamp_file)
+        ).filter(
+            Invoice.id.in_(invoice_ids),
+            Invoice.user_id == user_id
+        ).all()
+    
+    def _resolve_invoice_template(self, user_id: int, template_id: int = None) -> Optional["ResolvedTemplate"]:
+        """Resolve the invoice template to render with."""
+        from app.services.template_service import TemplateService
+        from app.models.template import TemplateCategory
+        
+        return TemplateService(self.db).resolve_template(
+            user_id, TemplateCategory.INVOICE, template_id
+        )
+    
+    def _build_invoice_job(self, invoice: Invoice, template: "ResolvedTemplate") -> InvoicePDFJob:
+        """Render a loaded invoice's HTML with a resolved template."""
+        # Company profile, logo and stamp were loaded with the invoice
+        company_profile = invoice.user.company_profile
+        
+        logo_url = None
+        stamp_url = None
+        
+        if company_profile:
+            if company_profile.logo_file:
+                logo_url = company_profile.logo_file.file_path
+            
+            if company_profile.stamp_file:
+                stamp_url = company_profile.stamp_file.file_path
+        
+        # Prepare template context
+        context = {
+            'invoice': invoice,
+            'company': company_profile,
+            'logo_url': logo_url,
+            'stamp_url': stamp_url,
+            'items': invoice.items,
+            'generated_at': datetime.now()
+        }
+        
+        # Load the compiled template from the shared environment
+        template_dir = os.path.dirname(template.html_path)
+        jinja_template = _get_compiled_template(template.html_path)
+        
+        # Render HTML content
+        html_content = jinja_template.render(context)
+        
+        pdf_filename = f"invoice_{invoice.invoice_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        
+        job = InvoicePDFJob(
+            invoice_id=invoice.id,
+            html_content=html_content,
+            base_url=template_dir,
+            css_path=template.css_path,
+            pdf_path=os.path.join(settings.upload_dir, "pdfs", pdf_filename),
+            template_id=template.id
+        )
+        
+        return job
+    
+    def _format_currency(self, amount: Decimal, symbol: str = "₹") -> str:
+        """Format currency amount."""
+        return _format_currency(amount, symbol)
+    
+    def _format_date(self, date_obj) -> str:
+        """Format date for display."""
+        return _format_date(date_obj)
+    
+    def _number_to_words(self, amount: Decimal) -> str:
+        """Convert an amount to words in the Indian numbering system."""
+        return _number_to_words(amount)
+    
+    def _get_pdf_css(self) -> str:
+        """Get CSS styles for PDF generation."""
+        return _PDF_CSS
+    
+    def generate_receipt_pdf(
+        self,
+        receipt: PaymentReceipt,
+        template_id: int = None,
+        target=None
+    ) -> Optional[bytes]:
+        """Generate PDF for a payment receipt using specified or default template.
+        
+        The PDF is written to `target` (a path or binary file object) when
+        given; otherwise it is returned as bytes.
+        """
+        
+        # Get template
+        from app.services.template_service import TemplateService
+        from app.models.template import TemplateCategory
+        
+        template = TemplateService(self.db).resolve_template(
+            receipt.user_id, TemplateCategory.RECEIPT, template_id
+        )
+        if not template:
+            raise ValueError("No receipt template available")
+        
+        # Update receipt template reference; left for the caller to commit
+        # with the PDF details, since committing here would expire the
+        # receipt and reload every column mid-render
+        receipt.template_id = template.id
+        
+        # Prepare template context
+        context = {
+            'receipt': receipt,
+            'generated_at': datetime.now()
+        }
+        
+        # Load the compiled template from the shared environment
+        template_dir = os.path.dirname(template.html_path)
+        jinja_template = _get_compiled_template(template.html_path)
+        
+        # Render HTML content
+        html_content = jinja_template.render(context)
+        
+        try:
+            # Generate PDF with WeasyPrint, straight into the target if given
+            return weasyprint.HTML(string=html_content, base_url=template_dir).write_pdf(
+                target,
+                stylesheets=[_get_stylesheet(template.css_path)],
+                **_render_options()
+            )
+            
+        except Exception:
+            logger.exception("PDF generation failed for receipt %s", receipt.id)
+            raise
+    
+    def _get_receipt_pdf_css(self) -> str:
+        """Get CSS styles for receipt PDF generation."""
+        return _RECEIPT_PDF_CSS
\ No newline at end of file
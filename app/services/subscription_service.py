@@ -1,25 +1,68 @@
 """Subscription service for managing user subscriptions."""
 
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+from fastapi import BackgroundTasks
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import logging
 import razorpay
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.models.user import User
 from app.models.plan import Plan
 from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.payment import Payment, PaymentStatus
+from app.models.invoice import Invoice, InvoiceStatus
+from app.core.cache import cache_get_many, cache_set, cache_delete, cache_is_shared
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+def _month_start(when: datetime = None) -> datetime:
+    """Start of the UTC calendar month containing `when` (default: now)."""
+    when = when or datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    else:
+        when = when.astimezone(timezone.utc)
+    return datetime(when.year, when.month, 1, tzinfo=timezone.utc)
+
+
+def _invoice_count_key(user_id: int, month_start: datetime) -> str:
+    """Cache key for a user's count of non-draft invoices in a month."""
+    return f"invoices:count:{user_id}:{month_start:%Y%m}"
+
+
+def _create_razorpay_client() -> Optional[razorpay.Client]:
+    """Create the Razorpay client with a pooled, keep-alive HTTP session."""
+    if not settings.razorpay_key_id:
+        return None
+    
+    client = razorpay.Client(auth=(settings.razorpay_key_id, settings.razorpay_key_secret))
+    # Retry only failed connections and idempotent calls; a retried
+    # subscription create could bill the user twice
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    client.session.mount("https://", adapter)
+    return client
+
+
+# Shared across requests so calls reuse warm TLS connections to the API
+_razorpay_client = _create_razorpay_client()
+
 
 class SubscriptionService:
     """Service class for subscription operations."""
     
     def __init__(self, db: Session):
         self.db = db
-        self.razorpay_client = razorpay.Client(
-            auth=(settings.razorpay_key_id, settings.razorpay_key_secret)
-        ) if settings.razorpay_key_id else None
+        self.razorpay_client = _razorpay_client
     
     def get_user_subscription(self, user_id: int) -> Optional[Subscription]:
         """Get active subscription for user."""
@@ -29,8 +72,8 @@ class SubscriptionService:
         ).first()
     
     def get_subscription_by_id(self, subscription_id: int) -> Optional[Subscription]:
-        """Get subscription by ID."""
-        return self.db.query(Subscription).filter(Subscription.id == subscription_id).first()
+        """Get subscription by ID (served from the identity map when already loaded)."""
+        return self.db.get(Subscription, subscription_id)
     
     def create_subscription(self, user_id: int, plan_id: int) -> Optional[Subscription]:
         """Create a new subscription."""
@@ -125,29 +168,108 @@ class SubscriptionService:
         if not subscription or not subscription.plan:
             return False, 0, 0
         
-        # Get current invoice count for this month (not subscription period)
-        from app.models.invoice import Invoice, InvoiceStatus
-        from datetime import datetime, timezone
+        # Invoice count for this month (not subscription period)
+        current_count = self.get_monthly_invoice_counts([user_id])[user_id]
+        
+        return self._invoice_limit_status(subscription, current_count)
+    
+    def check_invoice_limits_bulk(self, user_ids: List[int]) -> Dict[int, tuple[bool, int, int]]:
+        """Check invoice limits for several users with one query of each kind.
         
-        # Calculate start of current month
-        now = datetime.now(timezone.utc)
-        month_start = datetime(now.year, now.month, 1, tzinfo=timezone.utc)
+        Returns:
+            {user_id: (can_create, current_count, limit)}
+        """
+        subscriptions = {
+            subscription.user_id: subscription
+            for subscription in self.db.query(Subscription).filter(
+                Subscription.user_id.in_(user_ids),
+                Subscription.status == SubscriptionStatus.ACTIVE
+            )
+        }
+        counts = self.get_monthly_invoice_counts(user_ids)
         
-        current_count = self.db.query(Invoice).filter(
-            Invoice.user_id == user_id,
-            Invoice.status != InvoiceStatus.DRAFT,
-            Invoice.created_at >= month_start
-        ).count()
+        results = {}
+        for user_id in user_ids:
+            subscription = subscriptions.get(user_id)
+            if not subscription or not subscription.plan:
+                results[user_id] = (False, 0, 0)
+            else:
+                results[user_id] = self._invoice_limit_status(subscription, counts[user_id])
+        return results
+    
+    def get_monthly_invoice_counts(self, user_ids: List[int]) -> Dict[int, int]:
+        """Count each user's non-draft invoices created this month.
         
+        The counts enforce plan limits, so they are cached only when the
+        cache is shared; a per-process cache would keep serving a stale
+        count in the workers that did not see the invalidation.
+        """
+        month_start = _month_start()
+        shared = cache_is_shared()
+        if shared:
+            keys = [_invoice_count_key(user_id, month_start) for user_id in user_ids]
+            cached_counts = cache_get_many(keys)
+        else:
+            cached_counts = [None] * len(user_ids)
+        
+        counts = {}
+        missing = []
+        for user_id, cached in zip(user_ids, cached_counts):
+            if cached is None:
+                missing.append(user_id)
+            else:
+                counts[user_id] = int(cached)
+        
+        if missing:
+            fetched = dict.fromkeys(missing, 0)
+            fetched.update(
+                self.db.query(Invoice.user_id, func.count(Invoice.id)).filter(
+                    Invoice.user_id.in_(missing),
+                    Invoice.status != InvoiceStatus.DRAFT,
+                    Invoice.created_at >= month_start
+                ).group_by(Invoice.user_id).all()
+            )
+            if shared:
+                for user_id, count in fetched.items():
+                    cache_set(
+                        _invoice_count_key(user_id, month_start),
+                        count,
+                        ttl=settings.invoice_count_cache_ttl
+                    )
+            counts.update(fetched)
+        
+        return counts
+    
+    def invalidate_invoice_count(self, user_id: int, created_at: datetime) -> None:
+        """Drop the cached monthly count after an invoice leaves draft."""
+        cache_delete(_invoice_count_key(user_id, _month_start(created_at)))
+    
+    def _invoice_limit_status(self, subscription: Subscription, current_count: int) -> tuple[bool, int, int]:
+        """Apply the plan's invoice limit to a count."""
         limit = subscription.plan.invoice_limit
         if limit is None:  # Unlimited
             return True, current_count, -1
         
         return current_count < limit, current_count, limit
     
-    def get_all_subscriptions(self, skip: int = 0, limit: int = 100) -> List[Subscription]:
-        """Get all subscriptions (admin only)."""
-        return self.db.query(Subscription).offset(skip).limit(limit).all()
+    def get_all_subscriptions(
+        self,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[Subscription], Optional[int]]:
+        """Get a page of all subscriptions (admin only) and the next-page cursor.
+        
+        Pages are keyed on the primary key, so deep pages cost the same as
+        the first one.
+        """
+        query = self.db.query(Subscription)
+        if after_id is not None:
+            query = query.filter(Subscription.id > after_id)
+        
+        subscriptions = query.order_by(Subscription.id).limit(limit).all()
+        
+        next_after_id = subscriptions[-1].id if len(subscriptions) == limit else None
+        return subscriptions, next_after_id
     
     def process_payment_success(self, razorpay_payment_id: str, razorpay_subscription_id: str) -> bool:
         """Process successful payment."""
@@ -202,9 +324,21 @@ class SubscriptionService:
         
         return True
     
-    def handle_successful_payment(self, payment_id: int) -> bool:
-        """Handle successful payment and create receipt."""
-        from app.services.payment_receipt_service import PaymentReceiptService
+    def handle_successful_payment(
+        self,
+        payment_id: int,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> bool:
+        """Handle successful payment and create receipt.
+        
+        Only the receipt INSERT happens inline. Rendering the PDF and emailing
+        it are queued on `background_tasks` when given, so the caller can
+        respond as soon as the receipt exists; without it they run inline.
+        """
+        from app.services.payment_receipt_service import (
+            PaymentReceiptService,
+            send_receipt_email_task
+        )
         
         payment = self.db.query(Payment).filter(Payment.id == payment_id).first()
         if not payment or payment.status != PaymentStatus.SUCCESS:
@@ -212,17 +346,16 @@ class SubscriptionService:
         
         try:
             # Create payment receipt
-            receipt_service = PaymentReceiptService(self.db)
-            receipt = receipt_service.create_receipt_from_payment(payment_id)
-            
-            # Generate PDF automatically
-            receipt_service.generate_receipt_pdf(receipt.id)
-            
-            # Send email notification
-            receipt_service.send_receipt_email(receipt.id)
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error handling successful payment {payment_id}: {e}")
-            return False
\ No newline at end of file
+            receipt = PaymentReceiptService(self.db).create_receipt_from_payment(payment_id)
+        except Exception:
+            logger.exception("Failed to create receipt for payment %s", payment_id)
+            return False
+        
+        # Generate the PDF (if needed) and email it; failures here are logged
+        # and no longer undo the receipt
+        if background_tasks is not None:
+            background_tasks.add_task(send_receipt_email_task, receipt.id)
+        else:
+            send_receipt_email_task(receipt.id)
+        
+        return True
\ No newline at end of file
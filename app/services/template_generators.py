@@ -1,14 +1,7 @@
 """Additional template generators for the multi-template system."""
 
-class TemplateGenerators:
-    """Class containing all template generation methods."""
-    
-    # ===== INVOICE TEMPLATE GENERATORS =====
-    
-    @staticmethod
-    def generate_elegant_invoice_html() -> str:
-        """Generate elegant invoice HTML template."""
-        return """<!DOCTYPE html>
+# Template sources, built once at import
+_ELEGANT_INVOICE_HTML = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -18,14 +11,14 @@ class TemplateGenerators:
     <div class="invoice-container">
         <div class="elegant-header">
             <div class="header-content">
-                {% if logo_url %}
+                {%- if logo_url %}
                 <img src="{{ logo_url }}" alt="Logo" class="elegant-logo">
-                {% endif %}
+                {%- endif %}
                 <div class="company-info">
                     <h1 class="company-name">{{ company.company_name if company else invoice.user.full_name }}</h1>
-                    {% if company and company.address %}
+                    {%- if company and company.address %}
                     <div class="company-address">{{ company.address }}, {{ company.city }}</div>
-                    {% endif %}
+                    {%- endif %}
                 </div>
             </div>
             <div class="invoice-badge">
@@ -39,12 +32,12 @@ class TemplateGenerators:
             <div class="section-title">Bill To</div>
             <div class="client-card">
                 <div class="client-name">{{ invoice.client_name }}</div>
-                {% if invoice.client_address_line1 %}
+                {%- if invoice.client_address_line1 %}
                 <div class="client-address">{{ invoice.client_address_line1 }}, {{ invoice.client_city }}</div>
-                {% endif %}
-                {% if invoice.client_email %}
+                {%- endif %}
+                {%- if invoice.client_email %}
                 <div class="client-email">{{ invoice.client_email }}</div>
-                {% endif %}
+                {%- endif %}
             </div>
         </div>
         
@@ -59,19 +52,19 @@ class TemplateGenerators:
                     </tr>
                 </thead>
                 <tbody>
-                    {% for item in items %}
+                    {%- for item in items %}
                     <tr>
                         <td>
                             <div class="item-desc">{{ item.description }}</div>
-                            {% if item.notes %}
+                            {%- if item.notes %}
                             <div class="item-notes">{{ item.notes }}</div>
-                            {% endif %}
+                            {%- endif %}
                         </td>
                         <td class="text-center">{{ item.quantity }}</td>
                         <td class="text-right">{{ format_currency(item.rate, invoice.currency_symbol) }}</td>
                         <td class="text-right">{{ format_currency(item.amount, invoice.currency_symbol) }}</td>
                     </tr>
-                    {% endfor %}
+                    {%- endfor %}
                 </tbody>
             </table>
         </div>
@@ -82,12 +75,12 @@ class TemplateGenerators:
                     <span>Subtotal</span>
                     <span>{{ format_currency(invoice.subtotal, invoice.currency_symbol) }}</span>
                 </div>
-                {% if invoice.tax_amount > 0 %}
+                {%- if invoice.tax_amount > 0 %}
                 <div class="total-row">
                     <span>Tax</span>
                     <span>{{ format_currency(invoice.tax_amount, invoice.currency_symbol) }}</span>
                 </div>
-                {% endif %}
+                {%- endif %}
                 <div class="total-row grand-total">
                     <span>Total</span>
                     <span>{{ format_currency(invoice.grand_total, invoice.currency_symbol) }}</span>
@@ -95,12 +88,12 @@ class TemplateGenerators:
             </div>
         </div>
         
-        {% if invoice.notes %}
+        {%- if invoice.notes %}
         <div class="notes-section">
             <div class="notes-title">Notes</div>
             <div class="notes-content">{{ invoice.notes }}</div>
         </div>
-        {% endif %}
+        {%- endif %}
         
         <div class="elegant-footer">
             <div class="footer-line"></div>
@@ -110,11 +103,8 @@ class TemplateGenerators:
     </div>
 </body>
 </html>"""
-    
-    @staticmethod
-    def generate_elegant_invoice_css() -> str:
-        """Generate elegant invoice CSS template."""
-        return """@page { size: A4; margin: 1.5cm; }
+
+_ELEGANT_INVOICE_CSS = """@page { size: A4; margin: 1.5cm; }
 body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color: #2c3e50; background: #fefefe; }
 .invoice-container { max-width: 800px; margin: 0 auto; background: white; }
 .elegant-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 40px; padding: 30px 0; border-bottom: 3px solid #d4af37; }
@@ -153,11 +143,8 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
 .footer-line { height: 2px; background: linear-gradient(to right, transparent, #d4af37, transparent); margin-bottom: 15px; }
 .footer-text { font-size: 16px; color: #d4af37; font-style: italic; margin-bottom: 8px; }
 .generated-text { font-size: 11px; color: #95a5a6; }"""
-    
-    @staticmethod
-    def generate_corporate_invoice_html() -> str:
-        """Generate corporate invoice HTML template."""
-        return """<!DOCTYPE html>
+
+_CORPORATE_INVOICE_HTML = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -169,19 +156,19 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
             <div class="header-stripe"></div>
             <div class="header-content">
                 <div class="logo-section">
-                    {% if logo_url %}
+                    {%- if logo_url %}
                     <img src="{{ logo_url }}" alt="Company Logo" class="corporate-logo">
-                    {% endif %}
+                    {%- endif %}
                     <div class="company-details">
                         <h1 class="company-name">{{ company.company_name if company else invoice.user.full_name }}</h1>
-                        {% if company and company.address %}
+                        {%- if company and company.address %}
                         <div class="company-info">
                             {{ company.address }}, {{ company.city }}, {{ company.state }} {{ company.postal_code }}
                         </div>
-                        {% endif %}
-                        {% if company and company.phone %}
+                        {%- endif %}
+                        {%- if company and company.phone %}
                         <div class="company-contact">{{ company.phone }} | {{ invoice.user.email }}</div>
-                        {% endif %}
+                        {%- endif %}
                     </div>
                 </div>
                 <div class="invoice-info">
@@ -195,12 +182,12 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
                             <span class="label">Date:</span>
                             <span class="value">{{ format_date(invoice.invoice_date) }}</span>
                         </div>
-                        {% if invoice.due_date %}
+                        {%- if invoice.due_date %}
                         <div class="detail-item">
                             <span class="label">Due Date:</span>
                             <span class="value">{{ format_date(invoice.due_date) }}</span>
                         </div>
-                        {% endif %}
+                        {%- endif %}
                     </div>
                 </div>
             </div>
@@ -211,16 +198,16 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
                 <div class="section-header">BILL TO</div>
                 <div class="client-info">
                     <div class="client-name">{{ invoice.client_name }}</div>
-                    {% if invoice.client_address_line1 %}
+                    {%- if invoice.client_address_line1 %}
                     <div class="client-address">
                         {{ invoice.client_address_line1 }}
                         {% if invoice.client_address_line2 %}<br>{{ invoice.client_address_line2 }}{% endif %}
                         <br>{{ invoice.client_city }}, {{ invoice.client_state }} {{ invoice.client_postal_code }}
                     </div>
-                    {% endif %}
-                    {% if invoice.client_email %}
+                    {%- endif %}
+                    {%- if invoice.client_email %}
                     <div class="client-contact">{{ invoice.client_email }}</div>
-                    {% endif %}
+                    {%- endif %}
                 </div>
             </div>
         </div>
@@ -236,19 +223,19 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
                     </tr>
                 </thead>
                 <tbody>
-                    {% for item in items %}
+                    {%- for item in items %}
                     <tr class="item-row">
                         <td class="desc-cell">
                             <div class="item-title">{{ item.description }}</div>
-                            {% if item.notes %}
+                            {%- if item.notes %}
                             <div class="item-subtitle">{{ item.notes }}</div>
-                            {% endif %}
+                            {%- endif %}
                         </td>
                         <td class="qty-cell">{{ item.quantity }}</td>
                         <td class="rate-cell">{{ format_currency(item.rate, invoice.currency_symbol) }}</td>
                         <td class="amount-cell">{{ format_currency(item.amount, invoice.currency_symbol) }}</td>
                     </tr>
-                    {% endfor %}
+                    {%- endfor %}
                 </tbody>
             </table>
         </div>
@@ -259,12 +246,12 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
                     <span class="summary-label">SUBTOTAL</span>
                     <span class="summary-value">{{ format_currency(invoice.subtotal, invoice.currency_symbol) }}</span>
                 </div>
-                {% if invoice.tax_amount > 0 %}
+                {%- if invoice.tax_amount > 0 %}
                 <div class="summary-row">
                     <span class="summary-label">TAX</span>
                     <span class="summary-value">{{ format_currency(invoice.tax_amount, invoice.currency_symbol) }}</span>
                 </div>
-                {% endif %}
+                {%- endif %}
                 <div class="summary-row total-row">
                     <span class="summary-label">TOTAL</span>
                     <span class="summary-value">{{ format_currency(invoice.grand_total, invoice.currency_symbol) }}</span>
@@ -272,22 +259,22 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
             </div>
         </div>
         
-        {% if invoice.notes %}
+        {%- if invoice.notes %}
         <div class="notes-container">
             <div class="notes-header">NOTES</div>
             <div class="notes-body">{{ invoice.notes }}</div>
         </div>
-        {% endif %}
+        {%- endif %}
         
         <div class="corporate-footer">
             <div class="footer-stripe"></div>
             <div class="footer-content">
-                {% if stamp_url %}
+                {%- if stamp_url %}
                 <div class="signature-section">
                     <img src="{{ stamp_url }}" alt="Authorized Signature" class="signature-stamp">
                     <div class="signature-text">Authorized Signature</div>
                 </div>
-                {% endif %}
+                {%- endif %}
                 <div class="footer-info">
                     <div class="generated-info">Document generated on {{ generated_at.strftime('%B %d, %Y at %I:%M %p') }}</div>
                 </div>
@@ -296,11 +283,8 @@ body { font-family: 'Georgia', serif; font-size: 13px; line-height: 1.5; color:
     </div>
 </body>
 </html>"""
-    
-    @staticmethod
-    def generate_corporate_invoice_css() -> str:
-        """Generate corporate invoice CSS template."""
-        return """@page { size: A4; margin: 1cm; }
+
+_CORPORATE_INVOICE_CSS = """@page { size: A4; margin: 1cm; }
 body { font-family: 'Arial', sans-serif; font-size: 12px; line-height: 1.4; color: #2c3e50; margin: 0; padding: 0; }
 .invoice-container { max-width: 100%; margin: 0 auto; background: white; }
 .corporate-header { margin-bottom: 30px; }
@@ -354,4 +338,30 @@ body { font-family: 'Arial', sans-serif; font-size: 12px; line-height: 1.4; colo
 .signature-stamp { max-width: 100px; max-height: 60px; }
 .signature-text { font-size: 10px; color: #64748b; margin-top: 5px; }
 .footer-info { text-align: right; }
-.generated-info { font-size: 10px; color: #94a3b8; }"""
\ No newline at end of file
+.generated-info { font-size: 10px; color: #94a3b8; }"""
+
+
+class TemplateGenerators:
+    """Class containing all template generation methods."""
+    
+    # ===== INVOICE TEMPLATE GENERATORS =====
+    
+    @staticmethod
+    def generate_elegant_invoice_html() -> str:
+        """Generate elegant invoice HTML template."""
+        return _ELEGANT_INVOICE_HTML
+    
+    @staticmethod
+    def generate_elegant_invoice_css() -> str:
+        """Generate elegant invoice CSS template."""
+        return _ELEGANT_INVOICE_CSS
+    
+    @staticmethod
+    def generate_corporate_invoice_html() -> str:
+        """Generate corporate invoice HTML template."""
+        return _CORPORATE_INVOICE_HTML
+    
+    @staticmethod
+    def generate_corporate_invoice_css() -> str:
+        """Generate corporate invoice CSS template."""
+        return _CORPORATE_INVOICE_CSS
\ No newline at end of file
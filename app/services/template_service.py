@@ -1,8 +1,9 @@
 """Template service for managing invoice and receipt templates."""
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import and_, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import os
 import json
 import shutil
@@ -13,9 +14,56 @@ from app.models.template import Template, TemplateCategory, UserTemplatePreferen
 from app.models.user import User
 from app.models.subscription import Subscription
 from app.services.audit_service import AuditService
+from app.core.cache import cache_get, cache_set, cache_incr, cache_is_shared
 from app.config import settings
 
 
+class ResolvedTemplate(NamedTuple):
+    """The parts of a template needed to render with it."""
+    id: int
+    html_path: str
+    css_path: str
+
+
+# Bumped whenever templates or preferences change; resolved-template cache
+# keys include it, so one increment invalidates every cached resolution
+_TEMPLATE_GENERATION_KEY = "templates:generation"
+
+
+def _resolved_template_key(
+    generation: str,
+    user_id: int,
+    category: TemplateCategory,
+    template_id: Optional[int]
+) -> str:
+    """Cache key for a resolved template."""
+    return f"templates:resolved:{generation}:{category.value}:{user_id}:{template_id or 0}"
+
+
+def _mark_templates_changed(mapper, connection, target):
+    """Flag the session so the template cache is invalidated on commit."""
+    session = object_session(target)
+    if session is not None:
+        session.info["templates_changed"] = True
+
+
+for _model in (Template, UserTemplatePreference):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_templates_changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_template_cache(session):
+    """Invalidate cached resolutions once template changes are committed."""
+    if session.info.pop("templates_changed", False):
+        cache_incr(_TEMPLATE_GENERATION_KEY)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_template_changes(session):
+    session.info.pop("templates_changed", None)
+
+
 class TemplateService:
     """Service class for template operations."""
     
@@ -56,9 +104,12 @@ class TemplateService:
         """Get template by ID."""
         return self.db.query(Template).filter(Template.id == template_id).first()
     
-    def get_template_by_template_id(self, template_id: str) -> Optional[Template]:
-        """Get template by template_id string."""
-        return self.db.query(Template).filter(Template.template_id == template_id).first()
+    def get_template_by_template_id(self, template_id: str, category: TemplateCategory) -> Optional[Template]:
+        """Get template by template_id string; template ids are unique per category."""
+        return self.db.query(Template).filter(
+            Template.category == category,
+            Template.template_id == template_id
+        ).first()
     
     def get_user_default_template(self, user_id: int, category: TemplateCategory) -> Optional[Template]:
         """Get user's default template for a category."""
@@ -74,6 +125,48 @@ class TemplateService:
         # Return system default template
         return self.get_default_template(category)
     
+    def resolve_template(
+        self,
+        user_id: int,
+        category: TemplateCategory,
+        template_id: int = None
+    ) -> Optional[ResolvedTemplate]:
+        """Resolve the template to render with.
+        
+        Uses the requested template if it belongs to the category, else the
+        user's default, else the system default. Results are cached only in
+        a shared (Redis) cache: the invalidating generation bump has to reach
+        every worker, which the per-process fallback cannot do.
+        """
+        
+        shared = cache_is_shared()
+        if shared:
+            generation = cache_get(_TEMPLATE_GENERATION_KEY) or "0"
+            cache_key = _resolved_template_key(generation, user_id, category, template_id)
+            cached = cache_get(cache_key)
+            if cached is not None:
+                return ResolvedTemplate(*json.loads(cached))
+        
+        template = None
+        if template_id:
+            template = self.get_template_by_id(template_id)
+            if template and template.category != category:
+                template = None
+        
+        if not template:
+            template = self.get_user_default_template(user_id, category)
+        
+        if not template:
+            template = self.get_default_template(category)
+        
+        if not template:
+            return None
+        
+        resolved = ResolvedTemplate(template.id, template.html_path, template.css_path)
+        if shared:
+            cache_set(cache_key, json.dumps(resolved), ttl=settings.template_cache_ttl)
+        return resolved
+    
     def get_default_template(self, category: TemplateCategory) -> Optional[Template]:
         """Get system default template for a category."""
         
@@ -145,25 +238,7 @@ class TemplateService:
     ) -> Template:
         """Create a new template."""
         
-        # Create template directory
-        template_dir = os.path.join(
-            self.template_base_path,
-            template_data['category'] + "s",
-            template_data['template_id']
-        )
-        os.makedirs(template_dir, exist_ok=True)
-        
-        # Write HTML file
-        html_file = "template.html"
-        html_path = os.path.join(template_dir, html_file)
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        # Write CSS file
-        css_file = "style.css"
-        css_path = os.path.join(template_dir, css_file)
-        with open(css_path, 'w', encoding='utf-8') as f:
-            f.write(css_content)
+        template_dir = self._write_template_files(template_data, html_content, css_content)
         
         # Save preview image if provided
         preview_file = None
@@ -178,27 +253,7 @@ class TemplateService:
             image.save(preview_path, "PNG")
         
         # Create template record
-        template = Template(
-            template_id=template_data['template_id'],
-            name=template_data['name'],
-            category=TemplateCategory(template_data['category']),
-            description=template_data.get('description'),
-            version=template_data.get('version', '1.0.0'),
-            author=template_data.get('author'),
-            html_file=html_file,
-            css_file=css_file,
-            preview_image=preview_file,
-            is_active=template_data.get('is_active', True),
-            is_premium=template_data.get('is_premium', False),
-            sort_order=template_data.get('sort_order', 0),
-            features=json.dumps(template_data.get('features', [])),
-            supports_logo=template_data.get('supports_logo', True),
-            supports_signature=template_data.get('supports_signature', True),
-            supports_watermark=template_data.get('supports_watermark', False),
-            page_size=template_data.get('page_size', 'A4'),
-            orientation=template_data.get('orientation', 'portrait'),
-            margins=template_data.get('margins', '1cm')
-        )
+        template = Template(**self._template_values(template_data, preview_file))
         
         self.db.add(template)
         self.db.commit()
@@ -218,6 +273,89 @@ class TemplateService:
         
         return template
     
+    def bulk_create_templates(self, templates: List[Tuple[Dict[str, Any], str, str]]) -> int:
+        """Create many templates from (template_data, html_content, css_content).
+        
+        Every row goes in a single multi-row INSERT that skips templates
+        already present in their category, then files are written for the
+        rows actually inserted and everything commits once. Returns the
+        number created.
+        """
+        
+        if not templates:
+            return 0
+        
+        stmt = pg_insert(Template).values([
+            self._template_values(template_data) for template_data, _, _ in templates
+        ]).on_conflict_do_nothing(
+            index_elements=[Template.category, Template.template_id]
+        ).returning(Template.category, Template.template_id)
+        created = {(category.value, template_id) for category, template_id in self.db.execute(stmt)}
+        
+        try:
+            # Existing templates keep their (possibly edited) files
+            for template_data, html_content, css_content in templates:
+                if (template_data['category'], template_data['template_id']) in created:
+                    self._write_template_files(template_data, html_content, css_content)
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        # Bulk inserts skip mapper events, so flag the cache invalidation here
+        if created:
+            self.db.info["templates_changed"] = True
+        self.db.commit()
+        
+        return len(created)
+    
+    def _write_template_files(
+        self,
+        template_data: Dict[str, Any],
+        html_content: str,
+        css_content: str
+    ) -> str:
+        """Write a template's HTML and CSS files and return its directory."""
+        
+        template_dir = os.path.join(
+            self.template_base_path,
+            template_data['category'] + "s",
+            template_data['template_id']
+        )
+        os.makedirs(template_dir, exist_ok=True)
+        
+        with open(os.path.join(template_dir, "template.html"), 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        with open(os.path.join(template_dir, "style.css"), 'w', encoding='utf-8') as f:
+            f.write(css_content)
+        
+        return template_dir
+    
+    def _template_values(self, template_data: Dict[str, Any], preview_file: str = None) -> Dict[str, Any]:
+        """Column values for a new template row."""
+        
+        return {
+            'template_id': template_data['template_id'],
+            'name': template_data['name'],
+            'category': TemplateCategory(template_data['category']),
+            'description': template_data.get('description'),
+            'version': template_data.get('version', '1.0.0'),
+            'author': template_data.get('author'),
+            'html_file': "template.html",
+            'css_file': "style.css",
+            'preview_image': preview_file,
+            'is_active': template_data.get('is_active', True),
+            'is_premium': template_data.get('is_premium', False),
+            'sort_order': template_data.get('sort_order', 0),
+            'features': json.dumps(template_data.get('features', [])),
+            'supports_logo': template_data.get('supports_logo', True),
+            'supports_signature': template_data.get('supports_signature', True),
+            'supports_watermark': template_data.get('supports_watermark', False),
+            'page_size': template_data.get('page_size', 'A4'),
+            'orientation': template_data.get('orientation', 'portrait'),
+            'margins': template_data.get('margins', '1cm')
+        }
+    
     def update_template(
         self,
         template_id: int,
@@ -289,8 +427,10 @@ class TemplateService:
         
         # Remove template files
         template_dir = template.template_path
-        if os.path.exists(template_dir):
+        try:
             shutil.rmtree(template_dir)
+        except FileNotFoundError:
+            pass
         
         # Remove from database
         self.db.delete(template)
@@ -321,14 +461,10 @@ class TemplateService:
     def generate_template_preview(self, template: Template, sample_data: Dict[str, Any]) -> str:
         """Generate HTML preview of template with sample data."""
         
-        from jinja2 import Environment, FileSystemLoader
-        
-        # Setup Jinja2 environment
-        template_dir = os.path.dirname(template.html_path)
-        env = Environment(loader=FileSystemLoader(template_dir))
+        from app.services.pdf_service import _get_compiled_template
         
-        # Load template
-        jinja_template = env.get_template(template.html_file)
+        # Load the compiled template from the shared PDF environment
+        jinja_template = _get_compiled_template(template.html_path)
         
         # Render with sample data
         html_content = jinja_template.render(**sample_data)
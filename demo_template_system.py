@@ -228,7 +228,7 @@ def demo_template_preferences(db, free_user, premium_user):
     print("\n2. Setting user preferences:")
     
     # Free user can only use free templates
-    classic_template = template_service.get_template_by_template_id('classic')
+    classic_template = template_service.get_template_by_template_id('classic', TemplateCategory.INVOICE)
     if classic_template:
         success = template_service.set_user_default_template(
             user_id=free_user.id,
@@ -238,7 +238,7 @@ def demo_template_preferences(db, free_user, premium_user):
         print(f"   Free user set to classic template: {'✅' if success else '❌'}")
     
     # Premium user can use premium templates
-    modern_template = template_service.get_template_by_template_id('modern')
+    modern_template = template_service.get_template_by_template_id('modern', TemplateCategory.INVOICE)
     if modern_template:
         success = template_service.set_user_default_template(
             user_id=premium_user.id,
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test that queued receipt audit entries are written to the database.
+"""
+
+import uuid
+
+from app.database import SessionLocal
+from app.models.audit_log import AuditLog, AuditAction
+from app.services.audit_service import AuditService, shutdown_audit_writer
+
+def test_receipt_audit_row():
+    """Queue a receipt audit entry and check the background writer stores it."""
+
+    print("🧪 Testing Receipt Audit Logging")
+    print("=" * 40)
+
+    marker = f"Receipt audit test {uuid.uuid4().hex}"
+    db = SessionLocal()
+    try:
+        print("1. Queueing RECEIPT_CREATED audit entry...")
+        AuditService(db).log_action_async(
+            action=AuditAction.RECEIPT_CREATED,
+            description=marker,
+            resource_type="receipt",
+            extra_data={"receipt_number": "RCP-TEST-0001"}
+        )
+
+        # Flushes the queue and waits for the writer thread
+        shutdown_audit_writer()
+
+        print("2. Reading the audit entry back...")
+        row = db.query(AuditLog).filter(AuditLog.description == marker).first()
+        assert row is not None, "queued receipt audit entry was not written"
+        assert row.action == AuditAction.RECEIPT_CREATED
+        print(f"   ✅ Stored audit entry {row.id} with action {row.action.value}")
+
+        db.delete(row)
+        db.commit()
+    finally:
+        db.close()
+
+    print("\n" + "=" * 40)
+    print("Receipt audit test complete!")
+
+    return True
+
+if __name__ == "__main__":
+    test_receipt_audit_row()